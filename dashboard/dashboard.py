@@ -1,12 +1,12 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from pathlib import Path
-import requests
 import os
 import sys
 dashboard_dir = Path(__file__).parent
 sys.path.insert(0, str(dashboard_dir))
-from helper import get_video_id, get_all_comments
+from helper import get_video_id, get_all_comments, fetch_video_details, to_csv_bytes
 from dotenv import load_dotenv
 import asyncio
 
@@ -21,6 +21,22 @@ from model.visualization import CommentAnalyticsDashboard
 
 load_dotenv()
 
+@st.cache_resource
+def get_preprocessor():
+    """Text preprocessor shared across reruns"""
+    return AdvancedTextPreprocessor()
+
+@st.cache_resource
+def get_sentiment_analyzer():
+    """Sentiment model loaded once per server process instead of on every rerun"""
+    # int8 dynamic quantization by default; the ONNX export and torch.compile do slow one-off
+    # work on the first page load, so they are opt-in through COMMENTSENSE_ONNX / COMMENTSENSE_COMPILE
+    return SentimentAnalyzer(
+        compile_model=os.environ.get("COMMENTSENSE_COMPILE") == "1",
+        quantize=True,
+        onnx=os.environ.get("COMMENTSENSE_ONNX") == "1",
+    )
+
 st.set_page_config(page_title="Dashboard", layout="wide", page_icon="📊")
 
 leftcol, mid, rightcol = st.columns([1, 1, 1])
@@ -46,119 +62,121 @@ with st.form("video_form"):
     link = st.text_input("Enter YouTube Video Link:", placeholder="https://www.youtube.com/watch?v=example")
     submitted = st.form_submit_button("Analyze")
 
-if get_video_id(link) is None and submitted:
+video_id = get_video_id(link)
+if video_id is None and submitted:
     st.error("Invalid YouTube Video URL. Please try again.")
     st.stop()
-elif get_video_id(link) is None and not submitted:
+elif video_id is None:
     st.text("Awaiting YouTube Video URL input...")
     st.stop()
-else:
-    video_id = get_video_id(link)
 
 # Get video details
-video_url = f"https://www.googleapis.com/youtube/v3/videos?part=snippet,statistics&id={video_id}&key={API_KEY}"
-video_response = requests.get(video_url).json()
+video_response = fetch_video_details(video_id, API_KEY)
 
-video_details = pd.DataFrame(columns=["Title", "Description", "Views", "Likes", "Comments"])
-video_details["Title"] = [video_response["items"][0]["snippet"]["title"]]
-video_details["Description"] = [video_response["items"][0]["snippet"]["description"]]
-video_details["Views"] = [video_response["items"][0]["statistics"].get("viewCount", 0)]
-video_details["Likes"] = [video_response["items"][0]["statistics"].get("likeCount", 0)]
-video_details["Comments"] = [video_response["items"][0]["statistics"].get("commentCount", 0)]
+video_item = video_response["items"][0]
+video_details = pd.DataFrame([{
+    "Title": video_item["snippet"]["title"],
+    "Description": video_item["snippet"]["description"],
+    "Views": video_item["statistics"].get("viewCount", 0),
+    "Likes": video_item["statistics"].get("likeCount", 0),
+    "Comments": video_item["statistics"].get("commentCount", 0),
+}])
 
 st.header("Comments Data")
 st.divider()
 
 # Get comments (first 10000 comments - limit due to API constraints)
-comments = pd.DataFrame.from_dict(get_all_comments(video_id, API_KEY, limit=10000))
+comments = pd.DataFrame(get_all_comments(video_id, API_KEY, limit=10000)).astype({"author": "string", "text": "string"})
 
 # Basic Cleaning
 st.write(f"Fetched {len(comments)} comments initially...")
 
-# Remove duplicates
-comments = comments.drop_duplicates(subset=["text"])
-
-# Drop rows with missing comment text
-comments = comments.dropna(subset=["text"])
+# Drop missing, empty and duplicate comment texts with one mask and one copy
+text = comments["text"]
+mask = text.notna() & ~text.duplicated() & (text.str.len() > 0)
+comments = comments.loc[mask].reset_index(drop=True)
 st.write(f"After cleaning: {len(comments)} comments")
 
 if len(comments) == 0:
     st.warning("No comments found for this video or comments are disabled.")
     st.stop()
 
-# Perform comprehensive analysis
-with st.spinner("Performing comprehensive comment analysis..."):
-    
-    try:
-        # Initialize analyzers
-        preprocessor = AdvancedTextPreprocessor()
-        sentiment_analyzer = SentimentAnalyzer()
-        relevance_analyzer = RelevanceAnalyzer()
-        analytics = CommentAnalytics()
-        dashboard = CommentAnalyticsDashboard()
-        
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+analytics = CommentAnalytics()
+dashboard = CommentAnalyticsDashboard()
+
+# Perform comprehensive analysis once per video; widget reruns reuse the stored results
+if st.session_state.get('video_id') != video_id or 'analyzed' not in st.session_state:
+    with st.spinner("Performing comprehensive comment analysis..."):
+        try:
+            # Initialize analyzers
+            preprocessor = get_preprocessor()
+            sentiment_analyzer = get_sentiment_analyzer()
+            relevance_analyzer = RelevanceAnalyzer()
         
-        status_text.text("🔄 Preprocessing text and detecting spam...")
-        progress_bar.progress(20)
+            # Progress tracking
+            progress_bar = st.progress(0)
+            status_text = st.empty()
         
-        # Clean text
-        comments["textCleaned"] = comments["text"].apply(preprocessor.clean_text)
+            status_text.text("🔄 Preprocessing text and detecting spam...")
+            progress_bar.progress(20)
         
-        # Detect spam
-        comments["isSpam"] = comments["text"].apply(preprocessor.detect_spam)
+            # Clean text, detect spam and categorize comments
+            comments["textCleaned"], comments["isSpam"], comments["category"] = preprocessor.process_batch(comments["text"])
         
-        # Categorize comments
-        comments["category"] = comments["text"].apply(preprocessor.categorize_comment)
+            status_text.text("🎯 Analyzing sentiment...")
+            progress_bar.progress(50)
         
-        status_text.text("🎯 Analyzing sentiment...")
-        progress_bar.progress(50)
+            # Sentiment analysis
+            sentiments, scores = sentiment_analyzer.analyze_sentiment(comments["textCleaned"].tolist())
+            # Only three distinct labels, so keep them as a categorical column
+            comments["sentiment"] = pd.Categorical(sentiments)
+            comments["sentiment_score"] = scores
         
-        # Sentiment analysis
-        sentiments, scores = sentiment_analyzer.analyze_sentiment(comments["textCleaned"].tolist())
-        comments["sentiment"] = sentiments
-        comments["sentiment_score"] = scores
+            status_text.text("📊 Calculating relevance scores...")
+            progress_bar.progress(70)
         
-        status_text.text("📊 Calculating relevance scores...")
-        progress_bar.progress(70)
+            # Create video data for relevance analysis
+            video_data = pd.DataFrame({
+                'videoId': [video_id],
+                'title': [video_response["items"][0]["snippet"]["title"]],
+                'description': [video_response["items"][0]["snippet"]["description"]],
+                'tags': [" ".join(video_response["items"][0]["snippet"].get("tags", []))]
+            })
         
-        # Create video data for relevance analysis
-        video_data = pd.DataFrame({
-            'videoId': [video_id],
-            'title': [video_response["items"][0]["snippet"]["title"]],
-            'description': [video_response["items"][0]["snippet"]["description"]],
-            'tags': [" ".join(video_response["items"][0]["snippet"].get("tags", []))]
-        })
+            # Add videoId to comments for relevance analysis
+            comments["videoId"] = video_id
         
-        # Add videoId to comments for relevance analysis
-        comments["videoId"] = video_id
+            # Calculate relevance scores
+            comments["relevance_score"] = relevance_analyzer.batch_relevance_analysis(comments, video_data, text_column="text")
         
-        # Calculate relevance scores
-        comments["relevance_score"] = relevance_analyzer.batch_relevance_analysis(comments, video_data)
+            status_text.text("🔍 Assessing comment quality...")
+            progress_bar.progress(90)
         
-        status_text.text("🔍 Assessing comment quality...")
-        progress_bar.progress(90)
+            # Quality assessment
+            comments["quality_score"] = preprocessor.assess_quality_vectorized(comments["text"], comments["sentiment"])
         
-        # Quality assessment
-        comments["quality_score"] = comments.apply(
-            lambda row: preprocessor.assess_quality(row["text"], row["sentiment"]), axis=1
-        )
+            progress_bar.progress(100)
+            status_text.text("✅ Analysis completed!")
         
-        progress_bar.progress(100)
-        status_text.text("✅ Analysis completed!")
-        
-    except Exception as e:
-        st.error(f"An error occurred during analysis: {str(e)}")
-        st.write("Please try again with a different video or check your internet connection.")
-        st.stop()
+        except Exception as e:
+            st.error(f"An error occurred during analysis: {str(e)}")
+            st.write("Please try again with a different video or check your internet connection.")
+            st.stop()
+
+    st.session_state['analyzed'] = comments
+    st.session_state['video_id'] = video_id
+    # Figures and export from the previous analysis no longer apply
+    st.session_state.pop('charts', None)
+    st.session_state.pop('export_csv', None)
+
+comments = st.session_state['analyzed']
 
 # Display results
 st.subheader("📈 Analysis Results")
 
-# Calculate KPIs
-kpis = analytics.calculate_kpis(comments)
+# Calculate KPIs, the reductions behind them are shared with the insights below
+stats = analytics.shared_stats(comments)
+kpis = analytics.calculate_kpis(comments, stats)
 
 # Display KPIs in columns
 col1, col2, col3, col4 = st.columns(4)
@@ -180,7 +198,7 @@ with col4:
     st.metric("Makeup Comments", f"{kpis['Makeup Comments %']:.1f}%")
 
 # Generate insights
-insights = analytics.generate_insights(comments)
+insights = analytics.generate_insights(comments, stats)
 
 st.subheader("💡 Key Insights")
 for insight in insights:
@@ -189,29 +207,37 @@ for insight in insights:
 # Visualizations
 st.subheader("📊 Visualizations")
 
+# Figures are built once per analysed video, widget reruns reuse them
+if 'charts' not in st.session_state:
+    # One pass over the comments feeds every chart below
+    summary = analytics.compute_summary(comments)
+    st.session_state['charts'] = {
+        'quality': dashboard.create_quality_ratio_chart(comments, summary),
+        'sentiment': dashboard.create_sentiment_breakdown(comments, summary),
+        'category': dashboard.create_category_breakdown(comments, summary),
+        'spam': dashboard.create_spam_detection_chart(comments, summary),
+        'relevance': dashboard.create_relevance_distribution(comments, summary)
+    }
+charts = st.session_state['charts']
+
 col1, col2 = st.columns(2)
 
 with col1:
     # Quality ratio chart
-    quality_fig = dashboard.create_quality_ratio_chart(comments)
-    st.plotly_chart(quality_fig, use_container_width=True)
+    st.plotly_chart(charts['quality'], use_container_width=True)
     
     # Category breakdown
-    category_fig = dashboard.create_category_breakdown(comments)
-    st.plotly_chart(category_fig, use_container_width=True)
+    st.plotly_chart(charts['category'], use_container_width=True)
 
 with col2:
     # Sentiment breakdown
-    sentiment_fig = dashboard.create_sentiment_breakdown(comments)
-    st.plotly_chart(sentiment_fig, use_container_width=True)
+    st.plotly_chart(charts['sentiment'], use_container_width=True)
     
     # Spam detection chart
-    spam_fig = dashboard.create_spam_detection_chart(comments)
-    st.plotly_chart(spam_fig, use_container_width=True)
+    st.plotly_chart(charts['spam'], use_container_width=True)
 
 # Relevance distribution (full width)
-relevance_fig = dashboard.create_relevance_distribution(comments)
-st.plotly_chart(relevance_fig, use_container_width=True)
+st.plotly_chart(charts['relevance'], use_container_width=True)
 
 # Sample high-quality comments
 st.subheader("✨ Sample High-Quality Comments")
@@ -219,10 +245,10 @@ st.subheader("✨ Sample High-Quality Comments")
 high_quality_comments = comments[
     (comments['quality_score'] == 1) &
     (comments['isSpam'] == 0)
-].sort_values('relevance_score', ascending=False).head(5)
+].nlargest(5, 'relevance_score')
 
 if len(high_quality_comments) > 0:
-    for i, (_, comment) in enumerate(high_quality_comments.iterrows()):
+    for i, comment in enumerate(high_quality_comments.to_dict('records')):
         with st.expander(f"Comment {i+1} - {comment['sentiment'].upper()} (Relevance: {comment['relevance_score']:.3f})"):
             st.write(f"**Author:** {comment['author']}")
             st.write(f"**Category:** {comment['category']}")
@@ -240,35 +266,28 @@ st.dataframe(video_details, use_container_width=True)
 
 # Export functionality
 st.subheader("💾 Export Results")
-if st.button("Download Analysis Results as CSV"):
+# The export is built and serialized once per analysed video, like the charts
+if 'export_csv' not in st.session_state:
     # Create comprehensive export dataframe
     export_df = comments[['author', 'text', 'textCleaned', 'sentiment', 'sentiment_score', 
                          'category', 'quality_score', 'isSpam', 'relevance_score', 'likes']].copy()
-    
+
     # Add quality and spam labels for readability
-    export_df['quality_label'] = export_df['quality_score'].map({0: 'Low Quality', 1: 'High Quality'})
-    export_df['spam_label'] = export_df['isSpam'].map({0: 'Legitimate', 1: 'Spam'})
-    
-    # Convert to CSV
-    csv = export_df.to_csv(index=False)
-    st.download_button(
-        label="📥 Download CSV",
-        data=csv,
-        file_name=f"video_{video_id}_analysis.csv",
-        mime="text/csv"
-    )
+    export_df['quality_label'] = np.where(export_df['quality_score'].to_numpy() == 1, 'High Quality', 'Low Quality')
+    export_df['spam_label'] = np.where(export_df['isSpam'].to_numpy() == 1, 'Spam', 'Legitimate')
+    st.session_state['export_csv'] = to_csv_bytes(export_df)
+
+st.download_button(
+    label="📥 Download Analysis Results as CSV",
+    data=st.session_state['export_csv'],
+    file_name=f"video_{video_id}_analysis.csv",
+    mime="text/csv"
+)
 
 # Category-specific analysis
 st.subheader("🎯 Category-Specific Analysis")
 if len(comments) > 0:
-    category_analysis = comments.groupby('category').agg({
-        'quality_score': ['mean', 'count'],
-        'sentiment': lambda x: (x == 'positive').mean(),
-        'relevance_score': 'mean',
-        'isSpam': 'mean'
-    }).round(3)
-    
-    category_analysis.columns = ['Quality_Ratio', 'Comment_Count', 'Positive_Sentiment_Ratio', 'Avg_Relevance', 'Spam_Rate']
+    category_analysis = analytics.category_specific_analysis(comments)
     st.dataframe(category_analysis, use_container_width=True)
 
 # Display comments with analysis (with pagination for large datasets)
@@ -284,20 +303,21 @@ with col2:
 with col3:
     quality_filter = st.selectbox("Filter by Quality", ['All', 'High Quality', 'Low Quality'])
 
-# Apply filters
-filtered_comments = comments.copy()
+# Apply filters as one boolean mask and slice once
+mask = np.ones(len(comments), dtype=bool)
 if sentiment_filter != 'All':
-    filtered_comments = filtered_comments[filtered_comments['sentiment'] == sentiment_filter]
+    mask &= comments['sentiment'].to_numpy() == sentiment_filter
 if category_filter != 'All':
-    filtered_comments = filtered_comments[filtered_comments['category'] == category_filter]
+    mask &= comments['category'].to_numpy() == category_filter
 if quality_filter == 'High Quality':
-    filtered_comments = filtered_comments[filtered_comments['quality_score'] == 1]
+    mask &= comments['quality_score'].to_numpy() == 1
 elif quality_filter == 'Low Quality':
-    filtered_comments = filtered_comments[filtered_comments['quality_score'] == 0]
+    mask &= comments['quality_score'].to_numpy() == 0
+filtered_comments = comments.loc[mask, display_columns]
 
 st.write(f"Showing {len(filtered_comments)} of {len(comments)} comments")
 if len(filtered_comments) > 0:
-    st.dataframe(filtered_comments[display_columns], use_container_width=True)
+    st.dataframe(filtered_comments, use_container_width=True)
 else:
     st.write("No comments match the current filters.")
 
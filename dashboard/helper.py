@@ -1,8 +1,14 @@
 from urllib.parse import urlparse, parse_qs
+import asyncio
+import io
+import aiohttp
+import numpy as np
 import requests
 import streamlit as st
 
-@st.cache_data
+COMMENTS_URL = "https://www.googleapis.com/youtube/v3/commentThreads"
+VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+
 def get_video_id(youtube_url):
     parsed_url = urlparse(youtube_url)
     if parsed_url.hostname == "youtu.be":
@@ -13,6 +19,82 @@ def get_video_id(youtube_url):
     return None
 
 @st.cache_data
+def to_csv_bytes(df):
+    """Serialize a DataFrame to CSV bytes, cached on the frame's contents"""
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_data
+def to_parquet_bytes(df):
+    """Serialize a DataFrame to Parquet bytes; much smaller and faster than CSV for large frames"""
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_resource
+def get_http_session():
+    """Shared requests session so repeated API calls reuse the same connection"""
+    return requests.Session()
+
+@st.cache_data(ttl=3600)
+def fetch_video_details(video_id, api_key):
+    """Fetch snippet and statistics for a video, cached per (video_id, api_key) for an hour"""
+    params = {"part": "snippet,statistics", "id": video_id, "key": api_key}
+    return get_http_session().get(VIDEOS_URL, params=params).json()
+
+async def _fetch_all_async(video_id, api_key, limit=None):
+    """Page through commentThreads over one keep-alive session, prefetching the next page"""
+    authors, texts, likes = [], [], []
+
+    def page_size(fetched):
+        return 100 if limit is None else min(100, limit - fetched)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10)) as session:
+
+        async def fetch_page(page_token, max_results):
+            params = {
+                "part": "snippet",
+                "videoId": video_id,
+                "maxResults": max_results,
+                "textFormat": "plainText",
+                "key": api_key,
+            }
+            if page_token:
+                params["pageToken"] = page_token
+
+            async with session.get(COMMENTS_URL, params=params) as resp:
+                if resp.status != 200:
+                    return None
+                return await resp.json()
+
+        pending = asyncio.create_task(fetch_page(None, page_size(0)))
+        while pending is not None:
+            response = await pending
+            pending = None
+            if response is None:
+                break
+
+            items = response.get("items", [])
+            # stop early if we've reached the requested limit
+            if limit is not None:
+                items = items[:limit - len(texts)]
+            fetched = len(texts) + len(items)
+
+            # Page tokens are sequential, but the next request can be in flight while this page is parsed
+            next_page_token = response.get("nextPageToken")
+            if next_page_token and (limit is None or fetched < limit):
+                pending = asyncio.create_task(fetch_page(next_page_token, page_size(fetched)))
+
+            for item in items:
+                top_comment = item["snippet"]["topLevelComment"]["snippet"]
+                authors.append(top_comment.get("authorDisplayName", ""))
+                texts.append(top_comment.get("textDisplay", ""))
+                likes.append(top_comment.get("likeCount", 0))
+
+    return {"author": authors, "text": texts, "likes": np.asarray(likes, dtype=np.int32)}
+
+@st.cache_data(ttl=3600)
 def get_all_comments(video_id, api_key, limit=None):
     """Fetch top-level comments for a video.
 
@@ -22,13 +104,9 @@ def get_all_comments(video_id, api_key, limit=None):
         limit (int|None): Optional maximum number of comments to return. If None, fetches all available comments.
 
     Returns:
-        list[dict]: List of comment dicts with keys: 'author', 'text', 'likes'.
+        dict: Column lists keyed 'author', 'text' and 'likes' (likes as an int32 array).
     """
 
-    BASE_URL = "https://www.googleapis.com/youtube/v3/commentThreads"
-    comments = []
-    next_page_token = None
-
     # validate limit
     if limit is not None:
         try:
@@ -38,49 +116,4 @@ def get_all_comments(video_id, api_key, limit=None):
         except Exception:
             raise ValueError("limit must be a positive integer or None")
 
-    while True:
-        # determine how many results to request this page
-        if limit is None:
-            page_size = 100
-        else:
-            remaining = limit - len(comments)
-            if remaining <= 0:
-                break
-            page_size = min(100, remaining)
-
-        params = {
-            "part": "snippet",
-            "videoId": video_id,
-            "maxResults": page_size,
-            "textFormat": "plainText",
-            "key": api_key,
-        }
-        if next_page_token:
-            params["pageToken"] = next_page_token
-
-        resp = requests.get(BASE_URL, params=params)
-        if resp.status_code != 200:
-            break
-
-        response = resp.json()
-
-        for item in response.get("items", []):
-            top_comment = item["snippet"]["topLevelComment"]["snippet"]
-            text = top_comment.get("textDisplay", "")
-            author = top_comment.get("authorDisplayName", "")
-            like_count = top_comment.get("likeCount", 0)
-            comments.append({
-                "author": author,
-                "text": text,
-                "likes": like_count
-            })
-
-            # stop early if we've reached the requested limit
-            if limit is not None and len(comments) >= limit:
-                break
-
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token:
-            break
-
-    return comments
\ No newline at end of file
+    return asyncio.run(_fetch_all_async(video_id, api_key, limit))
@@ -107,16 +107,16 @@ def example_quick_analysis():
     
     # Quick preprocessing
     preprocessor = AdvancedTextPreprocessor()
-    comments["textCleaned"] = comments["textOriginal"].apply(preprocessor.clean_text)
-    comments["isSpam"] = comments["textOriginal"].apply(preprocessor.detect_spam)
-    comments["category"] = comments["textOriginal"].apply(preprocessor.categorize_comment)
+    comments["textCleaned"], comments["isSpam"], comments["category"] = preprocessor.process_batch(comments["textOriginal"])
     
     # Quick sentiment analysis (first 10 comments)
     analyzer = SentimentAnalyzer()
     sample_comments = comments["textCleaned"].head(10).tolist()
     sentiments, scores = analyzer.analyze_sentiment(sample_comments)
-    comments.loc[:9, "sentiment"] = sentiments
-    comments.loc[:9, "sentiment_score"] = scores
+    # The sampled frame has a shuffled index, so align on the first 10 row labels rather than .loc[:9]
+    sample_index = comments.index[:len(sample_comments)]
+    comments["sentiment"] = pd.Series(sentiments, index=sample_index)
+    comments["sentiment_score"] = pd.Series(scores, index=sample_index)
     
     # Quick analytics
     analytics = CommentAnalytics()
@@ -124,11 +124,12 @@ def example_quick_analysis():
     print("\nQuick Stats:")
     print(f"- Total comments: {len(comments)}")
     print(f"- Spam rate: {comments['isSpam'].mean():.1%}")
-    print(f"- Category breakdown: {dict(comments['category'].value_counts())}")
+    category_counts = comments['category'].value_counts()
+    print(f"- Category breakdown: {dict(category_counts[category_counts > 0])}")
     print(f"- Sentiment (first 10): {dict(pd.Series(sentiments).value_counts())}")
     
     print("\nSample Comments:")
-    for i, (_, row) in enumerate(comments.head(5).iterrows(), 1):
+    for i, row in enumerate(comments.head(5).to_dict('records'), 1):
         print(f"{i}. \"{row['textOriginal'][:80]}...\"")
         print(f"   Category: {row['category']}, Spam: {'Yes' if row['isSpam'] else 'No'}")
         if pd.notna(row.get('sentiment')):
@@ -9,6 +9,8 @@ to perform comprehensive comment analysis.
 import warnings
 warnings.filterwarnings('ignore')
 
+import pandas as pd
+
 from model import (
     Dataset, 
     AdvancedTextPreprocessor, 
@@ -29,47 +31,43 @@ def run_full_analysis(sample_frac=0.01, dataset_id=1):
     # 1. Load Data
     print("\n📁 Loading datasets...")
     dataset = Dataset()
-    videos = dataset.getVideos()
-    comments = dataset.getComments(dataset_id=dataset_id, sample_frac=sample_frac)
+    # Only the columns the pipeline reads
+    videos = dataset.getVideos(columns=["videoId", "title", "description", "tags"])
+    comments = dataset.getComments(dataset_id=dataset_id, sample_frac=sample_frac,
+                                   columns=["commentId", "videoId", "textOriginal"])
     
     print(f"   Loaded {len(videos)} videos and {len(comments)} comments")
     
     # Clean data
-    comments = comments.drop_duplicates(subset=["commentId"])
-    videos = videos.drop_duplicates(subset=["videoId"])
-    comments = comments.dropna(subset=["textOriginal"])
+    # One combined mask so the comments frame is copied once, not once per step
+    keep = ~comments.duplicated(subset=["commentId"]) & comments["textOriginal"].notna()
+    comments = comments.loc[keep].reset_index(drop=True)
+    videos = videos.drop_duplicates(subset=["videoId"], ignore_index=True)
     print(f"   After cleaning: {len(videos)} videos and {len(comments)} comments")
     
     # 2. Text Preprocessing
     print("\n🔧 Preprocessing text...")
     preprocessor = AdvancedTextPreprocessor()
     
-    # Clean text
-    comments["textCleaned"] = comments["textOriginal"].apply(preprocessor.clean_text)
-    
-    # Detect spam
-    comments["isSpam"] = comments["textOriginal"].apply(preprocessor.detect_spam)
-    
-    # Categorize comments
-    comments["category"] = comments["textOriginal"].apply(preprocessor.categorize_comment)
+    # Clean text, detect spam and categorize comments
+    comments["textCleaned"], comments["isSpam"], comments["category"] = preprocessor.process_batch(comments["textOriginal"])
     
     print(f"   Spam comments detected: {comments['isSpam'].sum()} ({comments['isSpam'].mean()*100:.1f}%)")
-    print(f"   Category distribution: {dict(comments['category'].value_counts())}")
+    category_counts = comments['category'].value_counts()
+    print(f"   Category distribution: {dict(category_counts[category_counts > 0])}")
     
     # 3. Sentiment Analysis
     print("\n😊 Analyzing sentiment...")
     sentiment_analyzer = SentimentAnalyzer()
     sentiments, scores = sentiment_analyzer.analyze_sentiment(comments["textCleaned"].tolist())
-    comments["sentiment"] = sentiments
+    comments["sentiment"] = pd.Categorical(sentiments)
     comments["sentiment_score"] = scores
     
     print(f"   Sentiment distribution: {dict(pd.Series(sentiments).value_counts())}")
     
     # 4. Quality Assessment
     print("\n⭐ Assessing comment quality...")
-    comments["quality_score"] = comments.apply(
-        lambda row: preprocessor.assess_quality(row["textOriginal"], row["sentiment"]), axis=1
-    )
+    comments["quality_score"] = preprocessor.assess_quality_vectorized(comments["textOriginal"], comments["sentiment"])
     
     print(f"   High quality comments: {comments['quality_score'].sum()} ({comments['quality_score'].mean()*100:.1f}%)")
     
@@ -96,18 +94,20 @@ def run_full_analysis(sample_frac=0.01, dataset_id=1):
     # 8. Visualization
     print("\n📈 Creating visualizations...")
     dashboard = CommentAnalyticsDashboard()
+    # All chart counts come from one shared summary instead of one pass per chart
+    summary = analytics.compute_summary(comments)
     
     # Create and show key visualizations
-    quality_fig = dashboard.create_quality_ratio_chart(comments)
+    quality_fig = dashboard.create_quality_ratio_chart(comments, summary)
     print("   ✅ Quality ratio chart created")
     
-    sentiment_fig = dashboard.create_sentiment_breakdown(comments)
+    sentiment_fig = dashboard.create_sentiment_breakdown(comments, summary)
     print("   ✅ Sentiment breakdown created")
     
-    category_fig = dashboard.create_category_breakdown(comments)
+    category_fig = dashboard.create_category_breakdown(comments, summary)
     print("   ✅ Category breakdown created")
     
-    relevance_fig = dashboard.create_relevance_distribution(comments)
+    relevance_fig = dashboard.create_relevance_distribution(comments, summary)
     print("   ✅ Relevance distribution created")
     
     # 9. Export Results
@@ -160,7 +160,7 @@ def analyze_specific_video(video_id, comments_df):
             print(f"   {key}: {value}")
     
     # Insights
-    insights = video_analyzer.get_video_insights(comments_df, video_id)
+    insights = video_analyzer.get_video_insights(comments_df, video_id, metrics)
     print(f"\n💡 Insights:")
     for insight in insights:
         print(f"   • {insight}")
@@ -171,7 +171,7 @@ def analyze_specific_video(video_id, comments_df):
     )
     
     print(f"\n⭐ Sample High-Quality Comments:")
-    for i, (_, comment) in enumerate(high_quality_comments.iterrows(), 1):
+    for i, comment in enumerate(high_quality_comments.to_dict('records'), 1):
         print(f"   {i}. [{comment['sentiment'].upper()}] (Relevance: {comment['relevance_score']:.3f})")
         print(f"      \"{comment['textOriginal'][:100]}...\"")
         print(f"      Category: {comment['category']}\n")
@@ -188,8 +188,6 @@ def analyze_specific_video(video_id, comments_df):
 
 
 if __name__ == "__main__":
-    import pandas as pd
-    
     print("CommentSense: AI-Powered Comment Analysis System")
     print("By: Noog Troupers")
     print("\n" + "=" * 60)
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from collections import Counter
+from pathlib import Path
 
 
 class CommentAnalytics:
@@ -9,32 +10,70 @@ class CommentAnalytics:
     def __init__(self):
         pass
     
-    def calculate_kpis(self, df):
-        """Calculate key performance indicators"""
+    def compute_summary(self, df, bins=50):
+        """Compute the counts shared by the dashboard charts in a single place"""
+        relevance = df['relevance_score'].dropna().to_numpy(dtype=float)
+
+        return {
+            'quality_counts': df['quality_score'].value_counts(),
+            'sentiment_counts': df['sentiment'].value_counts(),
+            'category_counts': df['category'].value_counts(),
+            'spam_counts': df['isSpam'].value_counts(),
+            'relevance_hist': np.histogram(relevance, bins=bins),
+            'relevance_mean': relevance.mean() if len(relevance) else 0.0
+        }
+
+    def shared_stats(self, df):
+        """Reductions shared by the KPI, insight and recommendation methods, computed once"""
+        # One reduction for the numeric columns and one value_counts per label column;
+        # dropna=False keeps missing labels in the denominator like (col == x).mean()
+        category_share = df['category'].value_counts(normalize=True, dropna=False)
+        labelled = category_share[category_share.index.notna()]
+
+        return {
+            'means': df[['quality_score', 'isSpam', 'relevance_score']].mean(),
+            'sentiment_share': df['sentiment'].value_counts(normalize=True, dropna=False),
+            'category_share': category_share,
+            # Most common category and its share among labelled comments, as value_counts() gives them
+            'top_category': labelled.index[0] if len(labelled) else None,
+            'top_category_share': labelled.iloc[0] / labelled.sum() if len(labelled) else 0.0
+        }
+
+    def calculate_kpis(self, df, stats=None):
+        """Calculate key performance indicators, reusing stats from shared_stats when given"""
         total_comments = len(df)
 
+        if stats is None:
+            stats = self.shared_stats(df)
+        means = stats['means']
+        sentiment_share = stats['sentiment_share']
+        category_share = stats['category_share']
+
         kpis = {
             'Total Comments': total_comments,
-            'Quality Comment Ratio': df['quality_score'].mean(),
-            'Spam Rate': df['isSpam'].mean(),
-            'Average Relevance Score': df['relevance_score'].mean(),
-            'Positive Sentiment %': (df['sentiment'] == 'positive').mean() * 100,
-            'Negative Sentiment %': (df['sentiment'] == 'negative').mean() * 100,
-            'Neutral Sentiment %': (df['sentiment'] == 'neutral').mean() * 100,
-            'Skincare Comments %': (df['category'] == 'skincare').mean() * 100,
-            'Makeup Comments %': (df['category'] == 'makeup').mean() * 100,
-            'Fragrance Comments %': (df['category'] == 'fragrance').mean() * 100,
-            'Other Comments %': (df['category'] == 'other').mean() * 100
+            'Quality Comment Ratio': means['quality_score'],
+            'Spam Rate': means['isSpam'],
+            'Average Relevance Score': means['relevance_score'],
+            'Positive Sentiment %': sentiment_share.get('positive', 0.0) * 100,
+            'Negative Sentiment %': sentiment_share.get('negative', 0.0) * 100,
+            'Neutral Sentiment %': sentiment_share.get('neutral', 0.0) * 100,
+            'Skincare Comments %': category_share.get('skincare', 0.0) * 100,
+            'Makeup Comments %': category_share.get('makeup', 0.0) * 100,
+            'Fragrance Comments %': category_share.get('fragrance', 0.0) * 100,
+            'Other Comments %': category_share.get('other', 0.0) * 100
         }
 
         return kpis
     
-    def generate_insights(self, df):
-        """Generate actionable insights from the data"""
+    def generate_insights(self, df, stats=None):
+        """Generate actionable insights from the data, reusing stats from shared_stats when given"""
         insights = []
 
+        if stats is None:
+            stats = self.shared_stats(df)
+
         # Quality insights
-        quality_ratio = df['quality_score'].mean()
+        quality_ratio = stats['means']['quality_score']
         if quality_ratio < 0.3:
             insights.append(f"⚠️ Low quality comment ratio ({quality_ratio:.1%}). Consider content strategy review.")
         elif quality_ratio > 0.6:
@@ -43,7 +82,7 @@ class CommentAnalytics:
             insights.append(f"📊 Moderate quality comment ratio ({quality_ratio:.1%}). Room for improvement.")
 
         # Spam insights
-        spam_rate = df['isSpam'].mean()
+        spam_rate = stats['means']['isSpam']
         if spam_rate > 0.2:
             insights.append(f"🚨 High spam rate ({spam_rate:.1%}). Implement stricter comment moderation.")
         elif spam_rate < 0.05:
@@ -52,8 +91,8 @@ class CommentAnalytics:
             insights.append(f"📊 Moderate spam rate ({spam_rate:.1%}). Monitor and improve moderation.")
 
         # Sentiment insights
-        positive_ratio = (df['sentiment'] == 'positive').mean()
-        negative_ratio = (df['sentiment'] == 'negative').mean()
+        positive_ratio = stats['sentiment_share'].get('positive', 0.0)
+        negative_ratio = stats['sentiment_share'].get('negative', 0.0)
 
         if positive_ratio > 0.5:
             insights.append(f"😊 Positive sentiment dominates ({positive_ratio:.1%}). Audience responds well to content.")
@@ -63,12 +102,12 @@ class CommentAnalytics:
             insights.append(f"😐 Mixed sentiment distribution. Monitor audience reactions closely.")
 
         # Category insights
-        top_category = df['category'].value_counts().index[0]
-        top_category_pct = df['category'].value_counts(normalize=True).iloc[0]
+        top_category = stats['top_category']
+        top_category_pct = stats['top_category_share']
         insights.append(f"📊 '{top_category}' is the dominant category ({top_category_pct:.1%} of comments).")
 
         # Relevance insights
-        avg_relevance = df['relevance_score'].mean()
+        avg_relevance = stats['means']['relevance_score']
         if avg_relevance < 0.1:
             insights.append(f"⚠️ Low content relevance ({avg_relevance:.3f}). Comments may be off-topic.")
         elif avg_relevance > 0.3:
@@ -80,38 +119,42 @@ class CommentAnalytics:
     
     def category_specific_analysis(self, df):
         """Perform category-specific quality analysis"""
-        category_quality = df.groupby('category').agg({
-            'quality_score': ['mean', 'count'],
-            'sentiment': lambda x: (x == 'positive').mean(),
-            'relevance_score': 'mean',
-            'isSpam': 'mean'
-        }).round(3)
-
-        category_quality.columns = [
-            'Quality_Ratio', 'Comment_Count', 
-            'Positive_Sentiment_Ratio', 'Avg_Relevance', 'Spam_Rate'
-        ]
+        # Positive flag as a column so the named aggregation can average it
+        category_quality = df.assign(
+            is_positive=(df['sentiment'] == 'positive').astype('int8')
+        ).groupby('category', observed=True).agg(
+            Quality_Ratio=('quality_score', 'mean'),
+            Comment_Count=('quality_score', 'count'),
+            Positive_Sentiment_Ratio=('is_positive', 'mean'),
+            Avg_Relevance=('relevance_score', 'mean'),
+            Spam_Rate=('isSpam', 'mean')
+        ).round(3)
         
         return category_quality.sort_values('Comment_Count', ascending=False)
     
     def engagement_analysis(self, df):
         """Analyze engagement patterns"""
+        category_counts = df['category'].value_counts()
         engagement_metrics = {
             'total_engagement': len(df),
             'quality_engagement': df['quality_score'].sum(),
             'legitimate_engagement': len(df[df['isSpam'] == 0]),
             'positive_engagement': len(df[df['sentiment'] == 'positive']),
-            'category_engagement': df['category'].value_counts().to_dict(),
+            # Only categories that occur; value_counts on the categorical column also lists unused ones with 0
+            'category_engagement': category_counts[category_counts > 0].to_dict(),
             'avg_relevance': df['relevance_score'].mean()
         }
         
         return engagement_metrics
     
-    def generate_recommendations(self, df):
-        """Generate specific recommendations based on analysis"""
+    def generate_recommendations(self, df, kpis=None, stats=None):
+        """Generate specific recommendations based on analysis, reusing kpis and stats when already calculated"""
         recommendations = []
         
-        kpis = self.calculate_kpis(df)
+        if stats is None:
+            stats = self.shared_stats(df)
+        if kpis is None:
+            kpis = self.calculate_kpis(df, stats)
         
         # Quality recommendations
         if kpis['Quality Comment Ratio'] < 0.4:
@@ -129,7 +172,7 @@ class CommentAnalytics:
             recommendations.append("🤝 Engage more actively with audience concerns")
         
         # Category recommendations
-        dominant_category = df['category'].value_counts().index[0]
+        dominant_category = stats['top_category']
         if kpis[f'{dominant_category.title()} Comments %'] > 70:
             recommendations.append(f"🎨 Consider diversifying content beyond {dominant_category}")
             recommendations.append("📊 Explore cross-category content opportunities")
@@ -142,28 +185,35 @@ class CommentAnalytics:
         return recommendations
     
     def export_summary_report(self, df, filename="comment_analysis_report.csv"):
-        """Export comprehensive summary report"""
-        # Create summary dataframe
+        """Export comprehensive summary report as CSV, or Parquet/Feather by file extension"""
+        # Create summary dataframe; assign already returns a new frame, no extra copy needed
         summary_df = df[[
             'videoId', 'commentId', 'textOriginal', 'textCleaned',
             'sentiment', 'sentiment_score', 'category',
             'quality_score', 'isSpam', 'relevance_score'
-        ]].copy()
+        ]].assign(
+            # Add quality labels
+            quality_label=np.where(df['quality_score'] == 1, 'High Quality', 'Low Quality'),
+            spam_label=np.where(df['isSpam'] == 1, 'Spam', 'Legitimate')
+        )
 
-        # Add quality labels
-        summary_df['quality_label'] = summary_df['quality_score'].map({0: 'Low Quality', 1: 'High Quality'})
-        summary_df['spam_label'] = summary_df['isSpam'].map({0: 'Legitimate', 1: 'Spam'})
-        
-        # Save to CSV
-        summary_df.to_csv(filename, index=False)
+        # Columnar formats are much faster to write and smaller on disk than CSV
+        extension = Path(filename).suffix.lower()
+        if extension in ('.parquet', '.pq'):
+            summary_df.to_parquet(filename, engine='pyarrow', compression='snappy', index=False)
+        elif extension == '.feather':
+            summary_df.reset_index(drop=True).to_feather(filename)
+        else:
+            summary_df.to_csv(filename, index=False)
         
         return summary_df
     
     def print_analysis_summary(self, df):
         """Print a comprehensive analysis summary"""
-        kpis = self.calculate_kpis(df)
-        insights = self.generate_insights(df)
-        recommendations = self.generate_recommendations(df)
+        stats = self.shared_stats(df)
+        kpis = self.calculate_kpis(df, stats)
+        insights = self.generate_insights(df, stats)
+        recommendations = self.generate_recommendations(df, kpis, stats)
         
         print("=" * 60)
         print("COMMENT ANALYSIS SUMMARY REPORT")
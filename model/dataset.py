@@ -1,38 +1,62 @@
 import pandas as pd
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .paths import CACHE_DIR
+
+
+def read_csv_cached(url, columns=None):
+    """Read a remote CSV, keeping a Parquet copy on disk so later runs skip download and parsing"""
+    path = CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.parquet"
+    if path.exists():
+        # Parquet is columnar, so unread columns are never loaded
+        return pd.read_parquet(path, columns=columns)
+
+    # pyarrow's multithreaded parser; dtypes stay NumPy-backed so cached and fresh reads match
+    df = pd.read_csv(url, engine="pyarrow")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so an interrupted run never leaves a partial cache entry
+        tmp_path = path.with_suffix(".tmp")
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Could not cache {url}: {e}")
+    # The cache always holds every column, only the returned frame is narrowed
+    return df if columns is None else df[columns]
 
 
 class Dataset:
-    comment_links = [
+    comment_links = (
         "https://storage.googleapis.com/dataset_hosting/comments1.csv",
         "https://storage.googleapis.com/dataset_hosting/comments2.csv",
         "https://storage.googleapis.com/dataset_hosting/comments3.csv",
         "https://storage.googleapis.com/dataset_hosting/comments4.csv",
         "https://storage.googleapis.com/dataset_hosting/comments5.csv",
-    ]
+    )
 
     video_link = "https://storage.googleapis.com/dataset_hosting/videos.csv"
 
     @staticmethod
-    def getAllComments():
-        list_of_dfs = []
-        for csv_file in Dataset.comment_links:
-            df = pd.read_csv(csv_file)
-            list_of_dfs.append(df)
+    def getAllComments(columns=None):
+        # Downloads are network bound, so fetch all files concurrently (executor.map keeps file order)
+        with ThreadPoolExecutor(max_workers=len(Dataset.comment_links)) as executor:
+            list_of_dfs = list(executor.map(lambda url: read_csv_cached(url, columns), Dataset.comment_links))
         return pd.concat(list_of_dfs, ignore_index=True)
 
     @staticmethod
-    def getComments(dataset_id=1, sample_frac=0.1):
-        if dataset_id not in range(1, len(Dataset.comment_links) + 1):
+    def getComments(dataset_id=1, sample_frac=0.1, columns=None):
+        if not 1 <= dataset_id <= len(Dataset.comment_links):
             raise ValueError(f"dataset_id must be between 1 and {len(Dataset.comment_links)}")
 
-        df = pd.read_csv(Dataset.comment_links[dataset_id - 1])
+        df = read_csv_cached(Dataset.comment_links[dataset_id - 1], columns)
         if sample_frac < 1.0:
             df = df.sample(frac=sample_frac, random_state=42)
         return df
 
     @staticmethod
-    def getVideos():
-        return pd.read_csv(Dataset.video_link)
+    def getVideos(columns=None):
+        return read_csv_cached(Dataset.video_link, columns)
 
 
 # Initialize dataset
@@ -0,0 +1,5 @@
+import os
+from pathlib import Path
+
+# On-disk cache shared by the dataset loader and the model exports, override with COMMENTSENSE_CACHE
+CACHE_DIR = Path(os.environ.get("COMMENTSENSE_CACHE", Path.home() / ".cache" / "commentsense"))
@@ -1,10 +1,13 @@
 import pandas as pd
+import numpy as np
 import re
 import string
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer
+from joblib import Parallel, delayed, effective_n_jobs
+from .text_features import text_features, repetitive_texts, WORD_COUNT
 import warnings
 
 # Suppress warnings
@@ -50,6 +53,32 @@ class AdvancedTextPreprocessor:
             'dm me', 'link in bio', 'promo code', 'discount', '50% off', 'sale'
         ]
 
+        # Words signalling an engaged (rather than throwaway) comment
+        self.engagement_words = ['love', 'amazing', 'recommend', 'favorite', 'best', 'great', 'good', 'bad', 'disappointed']
+
+        # Compiled patterns shared by the per-text and Series methods
+        self._noise_re = re.compile(r'http\S+|www\S+|@\w+|#\w+')
+        self._whitespace_re = re.compile(r'\s+')
+        self._emoji_re = re.compile("["
+            u"\U0001F600-\U0001F64F"  # emoticons
+            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+            u"\U0001F680-\U0001F6FF"  # transport & map symbols
+            u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
+            "]+", flags=re.UNICODE)
+        self._spam_re = self._keywords_re(self.spam_keywords)
+        self._category_res = {category: self._keywords_re(keywords)
+                              for category, keywords in self.category_keywords.items()}
+        self._category_any_re = self._keywords_re(
+            [keyword for keywords in self.category_keywords.values() for keyword in keywords])
+        self._engagement_re = self._keywords_re(self.engagement_words)
+        # Cyrillic, Arabic, kana and CJK, any of which means the text needs language detection
+        self._non_latin_re = re.compile(u'[\u0400-\u04ff\u0600-\u06ff\u3040-\u30ff\u4e00-\u9fff]')
+
+    @staticmethod
+    def _keywords_re(keywords):
+        """Compile a literal alternation matching any of the keywords"""
+        return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
     def clean_text(self, text):
         """Clean and preprocess text"""
         if pd.isna(text) or not isinstance(text, str):
@@ -59,11 +88,15 @@ class AdvancedTextPreprocessor:
         text = str(text).lower().strip()
 
         # Remove URLs, mentions, hashtags
-        text = re.sub(r'http\S+|www\S+|@\w+|#\w+', '', text)
+        text = self._noise_re.sub('', text)
 
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = self._whitespace_re.sub(' ', text)
+
+        return self._tokenize_and_stem(text)
 
+    def _tokenize_and_stem(self, text):
+        """Tokenize, drop stopwords/punctuation and stem already normalized text"""
         # Tokenize
         tokens = word_tokenize(text)
 
@@ -78,6 +111,8 @@ class AdvancedTextPreprocessor:
     async def translate_text(self, text):
         """Translate text to English"""
         # Detect if text is English, if so no translation needed
+        if isinstance(text, str) and self._likely_english([text])[0]:
+            return text
         try:
             if detect(text) == 'en':
                 return text
@@ -95,44 +130,54 @@ class AdvancedTextPreprocessor:
 
     async def batch_translate_text(self, texts, batch_size=100):
         """Translate a list of texts to English in batches"""
-        translated_texts = []
+        # Empty strings and non-string values come back as empty strings
+        text = pd.Series(list(texts), dtype=object)
+        valid = text.map(lambda t: isinstance(t, str) and bool(t.strip())).to_numpy(dtype=bool)
+        translated = text.where(valid, "")
+
+        # Mostly-ASCII Latin text is taken as English without calling detect or the translator,
+        # only the residual is language-detected (assumed English if detection fails)
+        candidates = np.flatnonzero(valid)
+        candidates = candidates[~self._likely_english(text.iloc[candidates])]
+        foreign = [i for i in candidates if not self._is_english(text.iat[i])]
+        if not foreign:
+            return translated.tolist()
+
+        # Batches are sent concurrently rather than one after another
+        batches = [foreign[i:i + batch_size] for i in range(0, len(foreign), batch_size)]
         async with Translator() as translator:
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                try:
-                    # Filter out empty strings or non-string types before translating
-                    valid_batch = [text for text in batch if isinstance(text, str) and text.strip()]
-                    if not valid_batch:
-                        translated_texts.extend([""] * len(batch)) # Maintain original list length
-                        continue
-
-                    # Detect language for the first item as a proxy
-                    lang = 'en'
-                    try:
-                        lang = detect(valid_batch[0])
-                    except:
-                        pass # Assume English if detection fails
-
-                    if lang == 'en':
-                        translated_texts.extend(batch)
-                    else:
-                        translated_batch_objs = await translator.translate(valid_batch, dest='en')
-                        # Ensure translated texts align with the original batch, handling empty inputs
-                        translated_results = []
-                        valid_batch_idx = 0
-                        for original_text in batch:
-                            if isinstance(original_text, str) and original_text.strip():
-                                translated_results.append(translated_batch_objs[valid_batch_idx].text)
-                                valid_batch_idx += 1
-                            else:
-                                translated_results.append("") # Append empty string for invalid inputs
-                        translated_texts.extend(translated_results)
-
-                except Exception as e:
-                    print(f"Batch translation error (batch {i//batch_size + 1}): {e}")
-                    translated_texts.extend(batch) # Append original texts in case of error
-
-        return translated_texts
+            results = await asyncio.gather(*(
+                self._translate_batch(translator, text.iloc[idx].tolist(), number)
+                for number, idx in enumerate(batches, 1)))
+
+        for idx, values in zip(batches, results):
+            translated.iloc[idx] = values
+        return translated.tolist()
+
+    @staticmethod
+    async def _translate_batch(translator, batch, number):
+        """Translate one batch of texts, returning the originals if the request fails"""
+        try:
+            translated_batch_objs = await translator.translate(batch, dest='en')
+            return [obj.text for obj in translated_batch_objs]
+        except Exception as e:
+            print(f"Batch translation error (batch {number}): {e}")
+            return batch
+
+    @staticmethod
+    def _is_english(text):
+        """Detect whether text is English, assuming it is if detection fails"""
+        try:
+            return detect(text) == 'en'
+        except:
+            return True
+
+    def _likely_english(self, texts):
+        """Mask of texts that are almost all ASCII with no non-Latin script, cheap enough to skip detection"""
+        text = self._as_text(texts)
+        length = text.str.len().to_numpy()
+        ascii_length = text.str.encode('ascii', 'ignore').str.len().to_numpy()
+        return (ascii_length > 0.95 * length) & ~text.str.contains(self._non_latin_re).to_numpy(dtype=bool)
 
     def detect_spam(self, text):
         """Detect spam comments with improved logic"""
@@ -142,14 +187,7 @@ class AdvancedTextPreprocessor:
         text = str(text).lower()
 
         # Remove emojis for length check
-        emoji_pattern = re.compile("["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            "]+", flags=re.UNICODE)
-
-        text_no_emoji = emoji_pattern.sub('', text)
+        text_no_emoji = self._emoji_re.sub('', text)
 
         # Check for very short comments (likely spam/low quality)
         if len(text_no_emoji.strip()) < 3:
@@ -161,9 +199,10 @@ class AdvancedTextPreprocessor:
             return 1
 
         # Check for spam keywords
-        spam_score = sum(1 for keyword in self.spam_keywords if keyword in text)
-        if spam_score >= 2:
-            return 1
+        if self._spam_re.search(text):
+            spam_score = sum(1 for keyword in self.spam_keywords if keyword in text)
+            if spam_score >= 2:
+                return 1
 
         # Check for excessive caps
         if len(text) > 10 and sum(1 for c in text if c.isupper()) / len(text) > 0.7:
@@ -180,14 +219,112 @@ class AdvancedTextPreprocessor:
         category_scores = {}
 
         for category, keywords in self.category_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            category_scores[category] = score
+            if self._category_res[category].search(text):
+                category_scores[category] = sum(1 for keyword in keywords if keyword in text)
+            else:
+                category_scores[category] = 0
 
         if max(category_scores.values()) == 0:
             return 'other'
 
         return max(category_scores.keys(), key=category_scores.get)
 
+    @staticmethod
+    def _as_text(texts):
+        """Return texts as a string Series with missing values as empty strings"""
+        return pd.Series(texts).fillna("").astype(str)
+
+    @staticmethod
+    def _count_keywords(text, keywords, any_re):
+        """Number of distinct keywords present in each text, only scanning texts that match any_re"""
+        counts = np.zeros(len(text), dtype=int)
+        candidates = text.str.contains(any_re, regex=True).to_numpy(dtype=bool)
+        if candidates.any():
+            subset = text[candidates]
+            counts[candidates] = sum(subset.str.contains(keyword, regex=False) for keyword in keywords).to_numpy(dtype=int)
+        return counts
+
+    def _tokenize_and_stem_many(self, texts):
+        """Tokenize and stem a chunk of texts (unit of work for parallel cleaning)"""
+        return [self._tokenize_and_stem(t) for t in texts]
+
+    def clean_series(self, texts, n_jobs=-1, min_parallel=200):
+        """Clean and preprocess a Series of texts"""
+        text = self._as_text(texts).str.lower().str.strip()
+        text = text.str.replace(self._noise_re, '', regex=True)
+        text = text.str.replace(self._whitespace_re, ' ', regex=True)
+
+        # Tokenizing and stemming stay per text, so only run them once per unique text
+        unique = text.unique()
+        n_workers = effective_n_jobs(n_jobs)
+        if n_workers == 1 or len(unique) < min_parallel:
+            # Worker start-up costs more than it saves on small inputs
+            stemmed = self._tokenize_and_stem_many(unique)
+        else:
+            chunks = np.array_split(unique, n_workers)
+            results = Parallel(n_jobs=n_workers)(
+                delayed(self._tokenize_and_stem_many)(chunk) for chunk in chunks
+            )
+            stemmed = [t for chunk in results for t in chunk]
+
+        return text.map(dict(zip(unique, stemmed)))
+
+    def detect_spam_series(self, texts):
+        """Detect spam comments in a Series of texts, returns a 0/1 int8 Series"""
+        # Missing texts become empty strings and are caught by the length check
+        text = self._as_text(texts).str.lower()
+        text_no_emoji = text.str.replace(self._emoji_re, '', regex=True)
+
+        # Very short comments
+        too_short = (text_no_emoji.str.strip().str.len() < 3).to_numpy()
+
+        # Spam keywords (number of distinct keywords present)
+        spammy = self._count_keywords(text, self.spam_keywords, self._spam_re) >= 2
+
+        # Excessive caps, counted on the lowercased text like detect_spam; only non-ASCII
+        # characters without a lowercase form (e.g. math bold letters) can still be upper
+        shouting = np.zeros(len(text), dtype=bool)
+        candidates = ((text.str.len() > 10) & text.str.contains(r'[^\x00-\x7f]', regex=True)).to_numpy()
+        shouting[candidates] = [
+            sum(1 for c in t if c.isupper()) / len(t) > 0.7 for t in text[candidates]
+        ]
+
+        is_spam = too_short | spammy | shouting
+
+        # Excessive repetition (numba kernel over hashed words), skipping rows already flagged
+        remaining = ~is_spam
+        is_spam[remaining] = repetitive_texts(text_no_emoji[remaining].tolist()).astype(bool)
+
+        return pd.Series(is_spam.astype('int8'), index=text.index)
+
+    def categorize_series(self, texts):
+        """Categorize a Series of texts into beauty categories, returns a categorical Series"""
+        text = self._as_text(texts).str.lower()
+        categories = list(self.category_keywords)
+
+        # One column per category holding the number of distinct keywords present
+        scores = np.column_stack([
+            self._count_keywords(text, keywords, self._category_res[category])
+            for category, keywords in self.category_keywords.items()
+        ])
+
+        # argmax keeps the first category on ties, like categorize_comment;
+        # codes index categories + ['other'], so 'other' is the last code
+        codes = np.where(scores.max(axis=1) == 0, len(categories), scores.argmax(axis=1))
+        labels = pd.Categorical.from_codes(codes, categories=categories + ['other'])
+        return pd.Series(labels, index=text.index)
+
+    def process_batch(self, texts):
+        """Clean, spam-check and categorize texts in one call, returns (cleaned, isSpam, category)"""
+        # Comment data repeats a lot ("first!", emoji-only replies), so every column pass
+        # runs on the distinct texts only and the results are broadcast back by position
+        text = self._as_text(texts)
+        codes, uniques = pd.factorize(text)
+        unique_text = pd.Series(uniques, dtype=object)
+
+        results = (self.clean_series(unique_text), self.detect_spam_series(unique_text), self.categorize_series(unique_text))
+        return tuple(result.iloc[codes].set_axis(text.index) for result in results)
+
     def assess_quality(self, text, sentiment=None):
         """Assess comment quality based on multiple factors"""
         if pd.isna(text) or not isinstance(text, str):
@@ -204,19 +341,43 @@ class AdvancedTextPreprocessor:
             quality_score += 1
 
         # Product relevance
-        for keywords in self.category_keywords.values():
-            if any(keyword in text for keyword in keywords):
-                quality_score += 2
-                break
+        if self._category_any_re.search(text):
+            quality_score += 2
 
         # Sentiment consideration
         if sentiment and sentiment != 'neutral':
             quality_score += 1
 
         # Engagement indicators
-        engagement_words = ['love', 'amazing', 'recommend', 'favorite', 'best', 'great', 'good', 'bad', 'disappointed']
-        if any(word in text for word in engagement_words):
+        if self._engagement_re.search(text):
             quality_score += 1
 
         # Quality threshold
-        return 1 if quality_score >= 3 else 0
\ No newline at end of file
+        return 1 if quality_score >= 3 else 0
+
+    def assess_quality_vectorized(self, texts, sentiments):
+        """Assess comment quality for whole columns at once, returns a 0/1 int8 array"""
+        # Missing texts become empty strings, which can never reach the threshold
+        # Only the sentiment term varies per row, the text terms are scored once per distinct text
+        codes, uniques = pd.factorize(self._as_text(texts))
+        text = pd.Series(uniques, dtype=object).str.lower()
+        sentiments = pd.Series(sentiments).to_numpy()
+
+        # Length factor (reasonable length comments are better)
+        word_count = text_features(text.tolist())[:, WORD_COUNT]
+        good_length = (word_count >= 5) & (word_count <= 50)
+        ok_length = ((word_count >= 3) & (word_count < 5)) | ((word_count > 50) & (word_count <= 100))
+        text_score = np.where(good_length, 2, np.where(ok_length, 1, 0))
+
+        # Product relevance
+        text_score += 2 * text.str.contains(self._category_any_re, regex=True).to_numpy(dtype=int)
+
+        # Engagement indicators
+        text_score += text.str.contains(self._engagement_re, regex=True).to_numpy(dtype=int)
+
+        # Sentiment consideration
+        has_sentiment = pd.notna(sentiments) & (sentiments != '') & (sentiments != 'neutral')
+        quality_score = text_score[codes] + has_sentiment.astype(int)
+
+        # Quality threshold
+        return (quality_score >= 3).astype(np.int8)
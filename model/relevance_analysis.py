@@ -1,4 +1,6 @@
 import pandas as pd
+import numpy as np
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
@@ -27,21 +29,43 @@ class RelevanceAnalyzer:
         except:
             return 0.0
 
-    def batch_relevance_analysis(self, comments_df, videos_df):
-        """Perform batch relevance analysis"""
-        # Merge comments with video data
-        merged_df = comments_df.merge(videos_df[['videoId', 'title', 'description', 'tags']],
-                                     on='videoId', how='left')
-
-        # Calculate relevance scores
-        relevance_scores = []
-        for _, row in merged_df.iterrows():
-            score = self.calculate_relevance_score(
-                row.get('textOriginal', ''),
-                row.get('title', ''),
-                row.get('description', ''),
-                row.get('tags', '')
-            )
-            relevance_scores.append(score)
-
-        return relevance_scores
\ No newline at end of file
+    def batch_relevance_analysis(self, comments_df, videos_df, text_column='textOriginal'):
+        """Perform batch relevance analysis with one TF-IDF fit over all comments and videos"""
+        # Combine video content, one document per video
+        videos = videos_df.drop_duplicates(subset=['videoId'])
+        video_docs = (videos['title'].fillna('').astype(str) + ' ' +
+                      videos['description'].fillna('').astype(str) + ' ' +
+                      videos['tags'].fillna('').astype(str)).str.strip()
+        comment_docs = comments_df[text_column].fillna('').astype(str)
+
+        # Row of each comment's video in the video matrix (-1 when the video is unknown)
+        video_rows = pd.Index(videos['videoId']).get_indexer(comments_df['videoId'])
+
+        # Score each distinct (comment text, video) pair once; repeated comments reuse the result
+        # (pairs are encoded as one integer: text code * (videos + 1) + video row + 1)
+        text_codes, unique_texts = pd.factorize(comment_docs)
+        stride = len(videos) + 1
+        pair_codes, unique_keys = pd.factorize(text_codes.astype(np.int64) * stride + video_rows + 1)
+        unique_docs = unique_texts[unique_keys // stride]
+        unique_rows = unique_keys % stride - 1
+        known = unique_rows >= 0
+
+        unique_scores = np.zeros(len(unique_keys))
+        try:
+            # Fit a private copy so concurrent calls don't share fitted state;
+            # the fit keeps every comment so IDF weights match the full corpus
+            vectorizer = clone(self.vectorizer).set_params(max_features=None)
+            vectorizer.fit(pd.concat([comment_docs, video_docs], ignore_index=True))
+            # Only comments on a known video can score, so only those are transformed
+            comment_matrix = vectorizer.transform(unique_docs[known])
+            video_matrix = vectorizer.transform(video_docs)
+        except ValueError:
+            # Empty vocabulary, nothing can be relevant
+            return np.zeros(len(comments_df)).tolist()
+
+        # TF-IDF rows are L2-normalised, so the row-wise dot product is the cosine similarity;
+        # each video is vectorised once and its row is shared by all of its comments
+        pairs = comment_matrix.multiply(video_matrix[unique_rows[known]])
+        unique_scores[known] = np.asarray(pairs.sum(axis=1)).ravel()
+
+        return unique_scores[pair_codes].tolist()
@@ -1,14 +1,17 @@
 import pandas as pd
+import numpy as np
 import torch
 from transformers import pipeline
+import platform
 import warnings
+from .paths import CACHE_DIR
 
 warnings.filterwarnings('ignore')
 
 
 class SentimentAnalyzer:
-    def __init__(self, model_name="cardiffnlp/twitter-roberta-base-sentiment-latest"):
-        """Initialize sentiment analyzer with specified model"""
+    def __init__(self, model_name="cardiffnlp/twitter-roberta-base-sentiment-latest", compile_model=False, quantize=False, onnx=False):
+        """Initialize sentiment analyzer with specified model (quantize and onnx only apply on CPU)"""
         self.model_name = model_name
         self.device_index = 0 if torch.cuda.is_available() else -1
         
@@ -21,33 +24,104 @@ class SentimentAnalyzer:
             truncation=True,
             device=self.device_index,
         )
+        self.tokenizer = self.analyzer.tokenizer
+        self.model = self.analyzer.model
+
+        # Half precision weights on GPU halve memory traffic and use tensor cores;
+        # bfloat16 where supported keeps float32's range, float16 on older GPUs
+        self.half_dtype = None
+        self.use_onnx = onnx and self.device_index == -1
+        if self.device_index == 0:
+            self.half_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            self.model.to(self.half_dtype)
+        elif self.use_onnx:
+            # int8 ONNX Runtime model on CPU, the pipeline is rebuilt so single-text calls use it too
+            self.model = self._load_onnx()
+            self.analyzer = pipeline("sentiment-analysis", model=self.model, tokenizer=self.tokenizer, truncation=True)
+        elif quantize:
+            # int8 weights for the linear layers, activations are quantized on the fly
+            self.model.eval()
+            torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+        # torch.compile only applies to PyTorch models, not the ONNX Runtime one
+        if compile_model and not self.use_onnx and hasattr(torch, "compile"):
+            self.model = self._compile(self.model)
+
+    def _load_onnx(self):
+        """Load the model as a dynamically int8-quantized ONNX Runtime model, exporting it on first use"""
+        # optimum is only needed for this CPU path, so it is imported here
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        # Dynamic quantization needs no calibration data; the config matches the instructions this CPU has
+        target = self._quantization_target()
+        qconfig = getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=False)
+
+        # The export and quantization are cached on disk per target, later processes load the result directly
+        save_dir = CACHE_DIR / "onnx" / self.model_name.replace("/", "--") / target
+        if not (save_dir / "model_quantized.onnx").exists():
+            print(f"Exporting {self.model_name} to int8 ONNX ({target}) in {save_dir}")
+            exported = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(exported)
+            quantizer.quantize(save_dir=save_dir, quantization_config=qconfig)
+
+        return ORTModelForSequenceClassification.from_pretrained(save_dir, file_name="model_quantized.onnx")
+
+    @staticmethod
+    def _quantization_target():
+        """Name of the optimum AutoQuantizationConfig preset for this CPU, avx2 when the features are unknown"""
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            return "arm64"
+
+        # CPU feature flags are only readily available on Linux; elsewhere assume the avx2 baseline
+        flags = set()
+        try:
+            with open("/proc/cpuinfo") as cpuinfo:
+                for line in cpuinfo:
+                    if line.startswith("flags"):
+                        flags = set(line.split(":", 1)[1].split())
+                        break
+        except OSError:
+            pass
+
+        if "avx512_vnni" in flags:
+            return "avx512_vnni"
+        if "avx512f" in flags:
+            return "avx512"
+        return "avx2"
+
+    def _compile(self, model):
+        """Compile the model with torch.compile, keeping the eager model if that fails"""
+        # Padded batch shapes vary, so compile for dynamic shapes to avoid recompiling per batch
+        compiled = torch.compile(model, dynamic=True)
+        try:
+            # Compilation happens on the first call, so surface failures here rather than mid-analysis
+            warmup = self.tokenizer(["warm up"], return_tensors="pt").to(model.device)
+            with torch.inference_mode():
+                compiled(**warmup)
+            return compiled
+        except Exception as e:
+            print(f"torch.compile failed, using eager model: {e}")
+            return model
+
+    def tokenize(self, texts):
+        """Tokenize texts without padding; batches are padded later to their own longest sequence"""
+        return self.tokenizer(list(texts), truncation=True, max_length=512)
 
     def analyze_sentiment(self, texts, batch_size=64):
-        """Perform batch sentiment analysis on texts"""
+        """Perform batch sentiment analysis on texts, tokenizing each distinct text once"""
         if isinstance(texts, str):
             texts = [texts]
         
         # Prepare texts for analysis
         texts_series = pd.Series(texts).fillna("").astype(str)
-        unique_texts = list(pd.Series(texts_series.unique()))
+        first_occurrence = np.flatnonzero(~texts_series.duplicated().to_numpy())
+        unique_texts = texts_series.iloc[first_occurrence].tolist()
         
         # Batch processing to avoid memory issues
-        label_map = {}
-        score_map = {}
-        
-        for i in range(0, len(unique_texts), batch_size):
-            batch = unique_texts[i:i + batch_size]
-            try:
-                results = self.analyzer(batch, truncation=True, max_length=512)
-                for text, result in zip(batch, results):
-                    label_map[text] = result["label"]
-                    score_map[text] = result["score"]
-            except Exception as e:
-                print(f"Error processing batch {i//batch_size + 1}: {e}")
-                # Handle failed batch by assigning neutral sentiment
-                for text in batch:
-                    label_map[text] = "neutral"
-                    score_map[text] = 0.5
+        labels, scores = self.smart_batched_predict(unique_texts, batch_size=batch_size)
+        label_map = dict(zip(unique_texts, labels))
+        score_map = dict(zip(unique_texts, scores))
         
         # Map results back
         sentiments = texts_series.map(label_map).tolist()
@@ -55,6 +129,46 @@ class SentimentAnalyzer:
         
         return sentiments, scores
 
+    def smart_batched_predict(self, texts, batch_size=32):
+        """Predict sentiment in batches of similar token length to minimise padding"""
+        if len(texts) == 0:
+            return [], []
+
+        encodings = self.tokenize(texts)
+        order = np.argsort([len(ids) for ids in encodings["input_ids"]], kind="stable")
+        id2label = self.model.config.id2label
+
+        labels = np.empty(len(texts), dtype=object)
+        scores = np.empty(len(texts), dtype=float)
+
+        for i in range(0, len(order), batch_size):
+            idx = order[i:i + batch_size]
+            try:
+                # Pad only up to the longest sequence in this batch
+                batch = self.tokenizer.pad(
+                    {key: [encodings[key][j] for j in idx] for key in encodings.keys()},
+                    padding=True,
+                    return_tensors="pt",
+                )
+                batch = {key: value.to(self.model.device) for key, value in batch.items()}
+                with torch.inference_mode(), torch.autocast(
+                    device_type=self.model.device.type, dtype=self.half_dtype or torch.float16,
+                    enabled=self.half_dtype is not None
+                ):
+                    logits = self.model(**batch).logits
+                probs = logits.float().softmax(dim=-1)
+                best_scores, best_ids = probs.max(dim=-1)
+                labels[idx] = [id2label[label_id] for label_id in best_ids.tolist()]
+                scores[idx] = best_scores.cpu().numpy()
+            except Exception as e:
+                print(f"Error processing batch {i//batch_size + 1}: {e}")
+                # Handle failed batch by assigning neutral sentiment
+                labels[idx] = "neutral"
+                scores[idx] = 0.5
+
+        # Results were written back at their original positions
+        return labels.tolist(), scores.tolist()
+
     def analyze_single_text(self, text):
         """Analyze sentiment of a single text"""
         try:
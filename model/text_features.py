@@ -0,0 +1,142 @@
+import numpy as np
+from numba import njit, prange
+
+# Column order of the matrix returned by text_features
+LENGTH, WORD_COUNT, UPPER_COUNT = range(3)
+
+# 64-bit FNV-1a constants for hashing words
+FNV_OFFSET = np.uint64(14695981039346656037)
+FNV_PRIME = np.uint64(1099511628211)
+
+
+def encode_texts(texts):
+    """Pack texts into one UTF-8 byte buffer plus row offsets"""
+    encoded = [text.encode('utf-8') for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(data) for data in encoded])
+    buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return buffer, offsets
+
+
+@njit(cache=True)
+def _whitespace_width(buffer, j, end):
+    """Byte width of the str.split() whitespace character at buffer[j], 0 if it is not whitespace"""
+    b = buffer[j]
+    if b == 32 or 9 <= b <= 13 or 28 <= b <= 31:
+        return 1
+    # U+0085 and U+00A0
+    if b == 0xC2 and j + 1 < end and (buffer[j + 1] == 0x85 or buffer[j + 1] == 0xA0):
+        return 2
+    if j + 2 < end:
+        b1 = buffer[j + 1]
+        b2 = buffer[j + 2]
+        # U+1680, U+2000-U+200A, U+2028, U+2029, U+202F, U+205F and U+3000
+        if b == 0xE1 and b1 == 0x9A and b2 == 0x80:
+            return 3
+        if b == 0xE2 and b1 == 0x80 and (b2 <= 0x8A or b2 == 0xA8 or b2 == 0xA9 or b2 == 0xAF):
+            return 3
+        if b == 0xE2 and b1 == 0x81 and b2 == 0x9F:
+            return 3
+        if b == 0xE3 and b1 == 0x80 and b2 == 0x80:
+            return 3
+    return 0
+
+
+@njit(parallel=True, cache=True)
+def _repetitive(buffer, offsets):
+    n = offsets.size - 1
+    flags = np.zeros(n, dtype=np.int8)
+
+    for i in prange(n):
+        start = offsets[i]
+        end = offsets[i + 1]
+
+        # Hash every word; words are separated by whitespace, so there are at most (bytes + 1) // 2
+        hashes = np.empty((end - start + 1) // 2 + 1, dtype=np.uint64)
+        words = 0
+        h = FNV_OFFSET
+        in_word = False
+
+        j = start
+        while j < end:
+            width = _whitespace_width(buffer, j, end)
+            if width > 0:
+                if in_word:
+                    hashes[words] = h
+                    words += 1
+                    in_word = False
+                j += width
+            else:
+                if not in_word:
+                    h = FNV_OFFSET
+                    in_word = True
+                h = (h ^ buffer[j]) * FNV_PRIME
+                j += 1
+        if in_word:
+            hashes[words] = h
+            words += 1
+
+        # Distinct words are the distinct hashes, counted after sorting
+        if words > 1:
+            sorted_hashes = np.sort(hashes[:words])
+            unique = 1
+            for k in range(1, words):
+                if sorted_hashes[k] != sorted_hashes[k - 1]:
+                    unique += 1
+            if unique < 0.5 * words:
+                flags[i] = 1
+
+    return flags
+
+
+@njit(parallel=True, cache=True)
+def _text_features(buffer, offsets):
+    n = offsets.size - 1
+    features = np.zeros((n, 3), dtype=np.float32)
+
+    for i in prange(n):
+        length = 0
+        words = 0
+        upper = 0
+        in_word = False
+        skip = 0
+        end = offsets[i + 1]
+
+        for j in range(offsets[i], end):
+            b = buffer[j]
+
+            # Branchless counts: each comparison adds 0 or 1, so unpredictable text causes no mispredicted jumps
+            length += (b & 0xC0) != 0x80  # characters, not UTF-8 continuation bytes
+            upper += (b >= 65) & (b <= 90)
+
+            # Remaining bytes of a multibyte whitespace character
+            if skip > 0:
+                skip -= 1
+                continue
+
+            # Same whitespace as str.split(), including the Unicode spaces
+            width = _whitespace_width(buffer, j, end)
+            if width > 0:
+                in_word = False
+                skip = width - 1
+            elif not in_word:
+                words += 1
+                in_word = True
+
+        features[i, LENGTH] = length
+        features[i, WORD_COUNT] = words
+        features[i, UPPER_COUNT] = upper
+
+    return features
+
+
+def text_features(texts):
+    """Per-text length, word count and uppercase count as a float32 matrix"""
+    buffer, offsets = encode_texts(texts)
+    return _text_features(buffer, offsets)
+
+
+def repetitive_texts(texts):
+    """Flag texts with more than one word where fewer than half of the str.split() words are distinct"""
+    buffer, offsets = encode_texts(texts)
+    return _repetitive(buffer, offsets)
@@ -50,32 +50,63 @@ class VideoAnalyzer:
         if len(video_data) == 0:
             return None
         
+        # sentiment and category are categorical, so value_counts also lists unused labels with 0
+        sentiment_shares = video_data['sentiment'].value_counts(normalize=True)
+        category_shares = video_data['category'].value_counts(normalize=True)
         metrics = {
             'total_comments': len(video_data),
             'quality_ratio': video_data['quality_score'].mean(),
             'spam_rate': video_data['isSpam'].mean(),
             'avg_relevance': video_data['relevance_score'].mean(),
-            'sentiment_breakdown': video_data['sentiment'].value_counts(normalize=True).to_dict(),
-            'category_breakdown': video_data['category'].value_counts(normalize=True).to_dict(),
+            'sentiment_breakdown': sentiment_shares[sentiment_shares > 0].to_dict(),
+            'category_breakdown': category_shares[category_shares > 0].to_dict(),
             'high_quality_comments': len(video_data[(video_data['quality_score'] == 1) & (video_data['isSpam'] == 0)])
         }
         
         return metrics
     
-    def get_top_performing_videos(self, comments_df, metric='Quality_Ratio', top_n=10):
-        """Get top performing videos based on specified metric"""
-        video_stats = self.get_video_analytics(comments_df)
+    def analyze_all_videos(self, comments_df):
+        """Performance metrics for every video at once, as a dict keyed by videoId"""
+        return self._video_metrics(comments_df).to_dict('index')
+
+    def _video_metrics(self, comments_df):
+        """Per-video performance metrics from one grouped pass, indexed by videoId"""
+        grouped = comments_df.assign(
+            is_high_quality=((comments_df['quality_score'] == 1) & (comments_df['isSpam'] == 0)).astype('int8')
+        ).groupby('videoId', sort=False)
+        metrics = grouped.agg(
+            total_comments=('videoId', 'size'),
+            quality_ratio=('quality_score', 'mean'),
+            spam_rate=('isSpam', 'mean'),
+            avg_relevance=('relevance_score', 'mean'),
+            high_quality_comments=('is_high_quality', 'sum')
+        )
+        for column in ['sentiment', 'category']:
+            shares = grouped[column].value_counts(normalize=True)
+            # Categorical labels come back for every video, including the ones it has no comments for
+            shares = shares[shares > 0]
+            breakdowns = {video_id: group.droplevel(0).to_dict() for video_id, group in shares.groupby(level=0, sort=False)}
+            # Videos whose labels are all missing get an empty breakdown, like value_counts() would
+            metrics[f'{column}_breakdown'] = [breakdowns.get(video_id, {}) for video_id in metrics.index]
+
+        return metrics[['total_comments', 'quality_ratio', 'spam_rate', 'avg_relevance',
+                        'sentiment_breakdown', 'category_breakdown', 'high_quality_comments']]
+
+    def get_top_performing_videos(self, comments_df, metric='Quality_Ratio', top_n=10, video_stats=None):
+        """Get top performing videos based on specified metric, reusing video_stats when already computed"""
+        if video_stats is None:
+            video_stats = self.get_video_analytics(comments_df)
         return video_stats.nlargest(top_n, metric)
     
-    def get_video_insights(self, comments_df, video_id):
-        """Generate actionable insights for a specific video"""
-        video_data = comments_df[comments_df['videoId'] == video_id]
+    def get_video_insights(self, comments_df, video_id, metrics=None):
+        """Generate actionable insights for a specific video, reusing its metrics when already computed"""
+        if metrics is None:
+            metrics = self.analyze_video_performance(comments_df, video_id)
         
-        if len(video_data) == 0:
+        if metrics is None:
             return ["No data available for this video"]
         
         insights = []
-        metrics = self.analyze_video_performance(comments_df, video_id)
         
         # Quality insights
         if metrics['quality_ratio'] < 0.3:
@@ -107,15 +138,16 @@ class VideoAnalyzer:
     
     def compare_videos(self, comments_df, video_ids):
         """Compare performance metrics across multiple videos"""
-        comparison_data = []
-        
-        for video_id in video_ids:
-            metrics = self.analyze_video_performance(comments_df, video_id)
-            if metrics:
-                metrics['video_id'] = video_id
-                comparison_data.append(metrics)
-        
-        return pd.DataFrame(comparison_data)
+        video_data = comments_df[comments_df['videoId'].isin(video_ids)]
+        if len(video_data) == 0:
+            return pd.DataFrame()
+
+        # One grouped pass for every metric instead of re-filtering the frame per video
+        comparison = self._video_metrics(video_data)
+
+        # Same row order as analyzing each requested video in turn, video_id as the last column
+        comparison = comparison.loc[[video_id for video_id in video_ids if video_id in comparison.index]]
+        return comparison.rename_axis('video_id').reset_index()[[*comparison.columns, 'video_id']]
     
     def get_sample_comments(self, comments_df, video_id, quality_filter='high', limit=5):
         """Get sample comments from a video based on quality filter"""
@@ -125,14 +157,14 @@ class VideoAnalyzer:
             filtered_data = video_data[
                 (video_data['quality_score'] == 1) & 
                 (video_data['isSpam'] == 0)
-            ].sort_values('relevance_score', ascending=False)
+            ].nlargest(limit, 'relevance_score')
         elif quality_filter == 'low':
             filtered_data = video_data[
                 (video_data['quality_score'] == 0) | 
                 (video_data['isSpam'] == 1)
-            ].sort_values('relevance_score', ascending=True)
+            ].nsmallest(limit, 'relevance_score')
         else:
-            filtered_data = video_data.sort_values('relevance_score', ascending=False)
+            filtered_data = video_data.nlargest(limit, 'relevance_score')
         
-        return filtered_data.head(limit)[['textOriginal', 'sentiment', 'category', 'relevance_score', 'quality_score', 'isSpam']]
+        return filtered_data[['textOriginal', 'sentiment', 'category', 'relevance_score', 'quality_score', 'isSpam']]
 
@@ -1,23 +1,98 @@
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 
+# Serialize figures with orjson, which encodes numpy arrays natively instead of through json's hooks
+pio.json.config.default_engine = "orjson"
 
-class CommentAnalyticsDashboard:
-    def __init__(self):
-        self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
+# Chart palette, immutable so every figure shares it instead of copying a list
+COLORS = ('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD')
+# Low/high quality and legitimate/spam
+QUALITY_COLORS = COLORS[:2]
+SPAM_COLORS = (COLORS[1], COLORS[0])
 
-    def create_quality_ratio_chart(self, df):
-        """Create quality ratio visualization"""
-        quality_counts = df['quality_score'].value_counts()
+class CommentAnalyticsDashboard:
+    # Layout of the per-video summary, shared by every call rather than rebuilt each time
+    _SUMMARY_COLUMNS = ['quality_score', 'sentiment', 'category', 'relevance_score']
+    _SUMMARY_TITLES = ('Quality Ratio', 'Sentiment Distribution', 'Category Breakdown', 'Relevance Scores')
+    # Subplot types per row; make_subplots fills in the spec dicts it gets, so fresh ones are built per call
+    _SUMMARY_SPECS = (('domain', 'xy'), ('domain', 'xy'))
 
-        fig = go.Figure(data=[
-            go.Pie(labels=['Low Quality', 'High Quality'],
-                   values=[quality_counts.get(0, 0), quality_counts.get(1, 0)],
-                   hole=0.4,
-                   marker_colors=['#FF6B6B', '#4ECDC4'])
-        ])
+    def __init__(self):
+        self.colors = COLORS
+        # Frame registered with set_frame and the row positions of each video in it
+        self._frame = None
+        self._video_rows = {}
+        # Per-video summary figures for the registered frame, dropped whenever a new frame is set
+        self._video_figures = {}
+        self._video_json = {}
+
+    def set_frame(self, df):
+        """Register a comments frame for repeated per-video summaries, indexing its rows by videoId once"""
+        # Label columns become categorical once so every per-video value_counts works on integer codes
+        self._frame = df[self._SUMMARY_COLUMNS].astype(
+            {'sentiment': 'category', 'category': 'category'})
+        self._video_rows = df.groupby('videoId', sort=False).indices
+        self._video_figures = {}
+        self._video_json = {}
+
+    @staticmethod
+    def _observed(counts):
+        """Drop zero counts, which value_counts keeps for unused categories of a categorical column"""
+        return counts[counts > 0]
+
+    def _quality_trace(self, df, summary=None):
+        """Quality ratio donut trace"""
+        quality_counts = summary['quality_counts'] if summary else df['quality_score'].value_counts()
+
+        return go.Pie(labels=['Low Quality', 'High Quality'],
+                      values=quality_counts.reindex([0, 1], fill_value=0).to_numpy(),
+                      hole=0.4,
+                      marker_colors=QUALITY_COLORS)
+
+    def _sentiment_trace(self, df, summary=None):
+        """Sentiment count bar trace"""
+        sentiment_counts = self._observed(summary['sentiment_counts'] if summary else df['sentiment'].value_counts())
+
+        # A plain trace skips plotly.express building its own DataFrame for a three-row chart
+        return go.Bar(x=sentiment_counts.index.to_numpy(), y=sentiment_counts.to_numpy(),
+                      marker_color=self.colors[:len(sentiment_counts)])
+
+    def _category_trace(self, df, summary=None, top_n=20):
+        """Horizontal category count bar trace for the top_n categories, largest at the top"""
+        category_counts = self._observed(summary['category_counts'] if summary else df['category'].value_counts())
+
+        # value_counts is sorted descending and horizontal bars are drawn bottom-up, so reverse the top rows;
+        # one bar per category keeps the chart the same size however many categories there are
+        top = category_counts.head(top_n)
+        colors = [self.colors[i % len(self.colors)] for i in range(len(top))]
+        return go.Bar(x=top.to_numpy()[::-1], y=top.index.to_numpy()[::-1], orientation='h',
+                      marker_color=colors[::-1])
+
+    def _spam_trace(self, df, summary=None):
+        """Legitimate vs spam bar trace"""
+        spam_counts = summary['spam_counts'] if summary else df['isSpam'].value_counts()
+
+        return go.Bar(x=['Legitimate', 'Spam'],
+                      y=spam_counts.reindex([0, 1], fill_value=0).to_numpy(),
+                      marker_color=SPAM_COLORS)
+
+    def _relevance_trace(self, df, summary=None):
+        """Pre-binned relevance histogram trace and the mean relevance score"""
+        if summary:
+            (counts, edges), mean = summary['relevance_hist'], summary['relevance_mean']
+        else:
+            relevance = df['relevance_score'].dropna().to_numpy(dtype=float)
+            counts, edges = np.histogram(relevance, bins=50)
+            mean = relevance.mean() if len(relevance) else 0.0
+
+        return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)), mean
+
+    def create_quality_ratio_chart(self, df, summary=None):
+        """Create quality ratio visualization, optionally from CommentAnalytics.compute_summary output"""
+        fig = go.Figure(data=[self._quality_trace(df, summary)])
 
         fig.update_layout(
             title="Comment Quality Ratio",
@@ -26,88 +101,121 @@ class CommentAnalyticsDashboard:
 
         return fig
 
-    def create_sentiment_breakdown(self, df):
+    def create_sentiment_breakdown(self, df, summary=None):
         """Create sentiment breakdown visualization"""
-        sentiment_counts = df['sentiment'].value_counts()
-
-        fig = px.bar(x=sentiment_counts.index, y=sentiment_counts.values,
-                     title="Sentiment Distribution",
-                     labels={'x': 'Sentiment', 'y': 'Count'},
-                     color=sentiment_counts.index,
-                     color_discrete_sequence=self.colors)
+        fig = go.Figure(data=[self._sentiment_trace(df, summary)])
 
-        fig.update_layout(showlegend=False)
+        fig.update_layout(title="Sentiment Distribution", xaxis_title='Sentiment', yaxis_title='Count',
+                          showlegend=False)
         return fig
 
-    def create_category_breakdown(self, df):
+    def create_category_breakdown(self, df, summary=None):
         """Create category breakdown visualization"""
-        category_counts = df['category'].value_counts()
-
-        fig = px.pie(values=category_counts.values, names=category_counts.index,
-                     title="Comment Categories",
-                     color_discrete_sequence=self.colors)
+        fig = go.Figure(data=[self._category_trace(df, summary)])
 
+        fig.update_layout(title="Comment Categories", xaxis_title='Count', yaxis_title='Category',
+                          showlegend=False)
         return fig
 
-    def create_spam_detection_chart(self, df):
+    def create_spam_detection_chart(self, df, summary=None):
         """Create spam detection visualization"""
-        spam_counts = df['isSpam'].value_counts()
-
-        fig = go.Figure(data=[
-            go.Bar(x=['Legitimate', 'Spam'],
-                   y=[spam_counts.get(0, 0), spam_counts.get(1, 0)],
-                   marker_color=['#4ECDC4', '#FF6B6B'])
-        ])
+        fig = go.Figure(data=[self._spam_trace(df, summary)])
 
         fig.update_layout(title="Spam Detection Results")
         return fig
 
-    def create_relevance_distribution(self, df):
-        """Create relevance score distribution"""
-        fig = px.histogram(df, x='relevance_score',
-                          title="Comment Relevance Score Distribution",
-                          labels={'x': 'Relevance Score', 'y': 'Count'})
+    def create_relevance_distribution(self, df, summary=None):
+        """Create relevance score distribution from pre-binned counts"""
+        trace, mean = self._relevance_trace(df, summary)
+        fig = go.Figure(data=[trace])
 
-        fig.add_vline(x=df['relevance_score'].mean(), line_dash="dash",
-                     annotation_text=f"Mean: {df['relevance_score'].mean():.3f}")
+        fig.update_layout(title="Comment Relevance Score Distribution",
+                          xaxis_title='Relevance Score', yaxis_title='Count', bargap=0)
+        fig.add_vline(x=mean, line_dash="dash", annotation_text=f"Mean: {mean:.3f}")
 
         return fig
 
-    def create_video_analysis_summary(self, df, video_id):
-        """Create per-video analysis summary"""
-        video_data = df[df['videoId'] == video_id]
+    def create_dashboard(self, df, summary=None):
+        """Create every overview chart as panels of one figure, so it is serialized and rendered once"""
+        fig = make_subplots(
+            rows=3, cols=2,
+            subplot_titles=('Comment Quality Ratio', 'Sentiment Distribution', 'Comment Categories',
+                            'Spam Detection Results', 'Comment Relevance Score Distribution'),
+            specs=[[{'type': 'domain'}, {'type': 'xy'}],
+                   [{'type': 'xy'}, {'type': 'xy'}],
+                   [{'type': 'xy', 'colspan': 2}, None]]
+        )
+
+        fig.add_trace(self._quality_trace(df, summary), row=1, col=1)
+        fig.add_trace(self._sentiment_trace(df, summary), row=1, col=2)
+        fig.add_trace(self._category_trace(df, summary), row=2, col=1)
+        fig.add_trace(self._spam_trace(df, summary), row=2, col=2)
+        relevance_trace, mean = self._relevance_trace(df, summary)
+        fig.add_trace(relevance_trace, row=3, col=1)
+        fig.add_vline(x=mean, line_dash="dash", annotation_text=f"Mean: {mean:.3f}", row=3, col=1,
+                      exclude_empty_subplots=False)
+
+        # Only the quality donut has a meaningful legend, the bars are labelled by their axes
+        fig.update_traces(showlegend=False, selector=dict(type='bar'))
+        fig.update_layout(height=1200, bargap=0, title_text="Comment Analytics Dashboard")
+
+        return fig
 
+    def create_video_analysis_summary(self, df, video_id):
+        """Create per-video analysis summary, pass df=None to use the frame registered with set_frame"""
+        if df is not None:
+            # Only the plotted columns are copied out of the frame
+            video_data = df.loc[df['videoId'] == video_id, self._SUMMARY_COLUMNS]
+            return self._video_summary_figure(video_data, video_id)
+
+        if self._frame is None:
+            raise ValueError("no frame registered, call set_frame first or pass df")
+
+        # The registered frame doesn't change, so each video's figure is built once
+        if video_id not in self._video_figures:
+            video_data = self._frame.iloc[self._video_rows.get(video_id, [])]
+            self._video_figures[video_id] = self._video_summary_figure(video_data, video_id)
+        return self._video_figures[video_id]
+
+    def create_video_analysis_summary_json(self, video_id):
+        """Per-video summary for the registered frame as a Plotly JSON string, serialized once per video"""
+        # For consumers that send the figure over HTTP, repeat requests skip the JSON encoder
+        if video_id not in self._video_json:
+            fig = self.create_video_analysis_summary(None, video_id)
+            self._video_json[video_id] = pio.to_json(fig) if fig is not None else None
+        return self._video_json[video_id]
+
+    def _video_summary_figure(self, video_data, video_id):
+        """Build the per-video summary subplots from that video's comments"""
         if len(video_data) == 0:
             return None
 
+        # Every label count is taken up front from the small per-video frame
+        quality_counts, sentiment_counts, category_counts = (
+            self._observed(video_data[column].value_counts()) for column in ('quality_score', 'sentiment', 'category'))
+
         # Create subplot figure
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Quality Ratio', 'Sentiment Distribution',
-                           'Category Breakdown', 'Relevance Scores'),
-            specs=[[{'type': 'domain'}, {'type': 'xy'}],
-                   [{'type': 'domain'}, {'type': 'xy'}]]
-        )
+        fig = make_subplots(rows=2, cols=2, subplot_titles=self._SUMMARY_TITLES,
+                            specs=[[{'type': kind} for kind in row] for row in self._SUMMARY_SPECS])
 
         # Quality ratio pie chart
-        quality_counts = video_data['quality_score'].value_counts()
         fig.add_trace(go.Pie(labels=['Low Quality', 'High Quality'],
-                            values=[quality_counts.get(0, 0), quality_counts.get(1, 0)],
+                            values=quality_counts.reindex([0, 1], fill_value=0).to_numpy(),
                             name="Quality"), row=1, col=1)
 
         # Sentiment bar chart
-        sentiment_counts = video_data['sentiment'].value_counts()
-        fig.add_trace(go.Bar(x=sentiment_counts.index, y=sentiment_counts.values,
+        fig.add_trace(go.Bar(x=sentiment_counts.index.to_numpy(), y=sentiment_counts.to_numpy(),
                             name="Sentiment"), row=1, col=2)
 
         # Category pie chart
-        category_counts = video_data['category'].value_counts()
-        fig.add_trace(go.Pie(labels=category_counts.index, values=category_counts.values,
+        fig.add_trace(go.Pie(labels=category_counts.index.to_numpy(), values=category_counts.to_numpy(),
                             name="Category"), row=2, col=1)
 
-        # Relevance histogram
-        fig.add_trace(go.Histogram(x=video_data['relevance_score'], name="Relevance"),
-                     row=2, col=2)
+        # Relevance histogram, binned in numpy rather than by Plotly per point
+        relevance = video_data['relevance_score'].dropna().to_numpy(dtype=float)
+        counts, edges = np.histogram(relevance, bins=50)
+        fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                            name="Relevance"), row=2, col=2)
 
         fig.update_layout(height=800, title_text=f"Video Analysis Summary - {video_id}")
 
@@ -0,0 +1,80 @@
+import pandas as pd
+from model.preprocessor import AdvancedTextPreprocessor
+
+
+def test_quality_vectorized_matches_scalar_on_unicode_whitespace():
+    """Words separated by NBSP, em or ideographic spaces count the same as str.split() counts them"""
+    preprocessor = AdvancedTextPreprocessor()
+    texts = [
+        "thank\u00a0you\u00a0for\u00a0this\u00a0video",
+        "watched\u3000the\u3000whole\u3000thing\u3000twice",
+        "one\u2003more\u2003time\u2003for\u2003me\u2003please",
+        "great\u00a0foundation for\u3000dry skin",
+        "nice video",
+        "",
+    ]
+    sentiments = ["positive", "positive", "negative", "neutral", "positive", "neutral"]
+
+    expected = [preprocessor.assess_quality(text, sentiment) for text, sentiment in zip(texts, sentiments)]
+    actual = preprocessor.assess_quality_vectorized(pd.Series(texts), pd.Series(sentiments)).tolist()
+
+    assert actual == expected
+
+
+def test_spam_caps_check_runs_on_lowercased_text():
+    """ASCII shouting is lowercased before the caps check, uppercase without a lowercase form still counts"""
+    preprocessor = AdvancedTextPreprocessor()
+    texts = [
+        "THIS IS SO GOOD WOW",
+        "\U0001d405\U0001d411\U0001d404\U0001d404 \U0001d412\U0001d413\U0001d414\U0001d405\U0001d405 \U0001d407\U0001d404\U0001d411\U0001d404",
+        "great video thanks a lot",
+    ]
+
+    expected = [0, 1, 0]
+    assert [preprocessor.detect_spam(text) for text in texts] == expected
+    assert preprocessor.detect_spam_series(pd.Series(texts)).tolist() == expected
+
+
+def test_process_batch_matches_scalar_methods():
+    """Cleaned text, spam flag and category agree with clean_text, detect_spam and categorize_comment"""
+    preprocessor = AdvancedTextPreprocessor()
+    texts = pd.Series([
+        "Love this foundation, my skin looks amazing!",
+        "Check out my channel and subscribe for free giveaways http://spam.example",
+        "first!",
+        "Love this foundation, my skin looks amazing!",
+        None,
+        "",
+        "wow wow wow wow",
+        "@someone what shampoo do you use for curly hair? #haircare",
+        "THIS LIPSTICK SHADE IS PERFECT",
+        "nice nice nice video",
+        "\U0001f60d\U0001f60d\U0001f60d",
+    ], index=range(10, 21))
+
+    cleaned, is_spam, category = preprocessor.process_batch(texts)
+
+    assert cleaned.index.equals(texts.index)
+    assert cleaned.tolist() == [preprocessor.clean_text(text) for text in texts]
+    assert is_spam.tolist() == [preprocessor.detect_spam(text) for text in texts]
+    assert category.astype(str).tolist() == [preprocessor.categorize_comment(text) for text in texts]
+
+
+def test_quality_vectorized_matches_scalar():
+    """assess_quality_vectorized agrees with assess_quality for every sentiment label"""
+    preprocessor = AdvancedTextPreprocessor()
+    texts = [
+        "I tried this serum for two weeks and my skin feels so much softer, would recommend",
+        "What foundation shade are you wearing in this video?",
+        "ok",
+        None,
+        "love it love it love it",
+        "This tutorial was really helpful because I always struggled with eyeliner",
+        "",
+    ]
+
+    for sentiment in ["positive", "negative", "neutral"]:
+        sentiments = [sentiment] * len(texts)
+        expected = [preprocessor.assess_quality(text, sentiment) for text in texts]
+        actual = preprocessor.assess_quality_vectorized(pd.Series(texts), pd.Series(sentiments)).tolist()
+        assert actual == expected
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from model.relevance_analysis import RelevanceAnalyzer
+
+
+VIDEOS = pd.DataFrame({
+    'videoId': ['v1', 'v2', 'v3'],
+    'title': ['Everyday makeup tutorial', 'Curly hair routine', 'Skincare for dry skin'],
+    'description': ['Foundation, concealer and blush', None, 'Moisturizer and serum review'],
+    'tags': ['makeup foundation', 'hair curls', None],
+})
+
+COMMENTS = pd.DataFrame({
+    'videoId': ['v1', 'v2', 'v1', 'v3', 'unknown', np.nan, 'v2', 'v1'],
+    'textOriginal': [
+        'which foundation shade is this',
+        'my curly hair loves this routine',
+        'which foundation shade is this',
+        'which foundation shade is this',
+        'great makeup tutorial',
+        'great makeup tutorial',
+        None,
+        'great makeup tutorial',
+    ],
+})
+
+
+def reference_scores(comments, videos):
+    """Cosine similarity of each comment to its video, with one TF-IDF fit over all documents"""
+    videos = videos.drop_duplicates(subset=['videoId'])
+    video_docs = (videos['title'].fillna('') + ' ' + videos['description'].fillna('') + ' ' +
+                  videos['tags'].fillna('')).str.strip()
+    comment_docs = comments['textOriginal'].fillna('').astype(str)
+    vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+    vectorizer.fit(pd.concat([comment_docs, video_docs], ignore_index=True))
+
+    docs_by_video = dict(zip(videos['videoId'], video_docs))
+    scores = []
+    for text, video_id in zip(comment_docs, comments['videoId']):
+        if video_id not in docs_by_video:
+            scores.append(0.0)
+            continue
+        matrix = vectorizer.transform([text, docs_by_video[video_id]])
+        scores.append(float(cosine_similarity(matrix[0:1], matrix[1:2])[0][0]))
+    return scores
+
+
+def test_batch_relevance_matches_reference():
+    """Repeated (text, video) pairs share a score and unknown or missing videos score 0"""
+    scores = RelevanceAnalyzer().batch_relevance_analysis(COMMENTS, VIDEOS)
+
+    assert len(scores) == len(COMMENTS)
+    np.testing.assert_allclose(scores, reference_scores(COMMENTS, VIDEOS))
+    assert scores[0] == scores[2]
+    assert scores[0] != scores[3]
+    assert scores[4] == 0.0 and scores[5] == 0.0
+    assert scores[6] == 0.0
+
+
+def test_batch_relevance_ignores_duplicate_video_rows():
+    """Repeated video rows are scored as the first row for that videoId"""
+    duplicated = pd.concat([VIDEOS, VIDEOS.iloc[[0, 2]].assign(title='unrelated title')], ignore_index=True)
+    analyzer = RelevanceAnalyzer()
+
+    scores = analyzer.batch_relevance_analysis(COMMENTS, duplicated)
+
+    assert len(scores) == len(COMMENTS)
+    np.testing.assert_allclose(scores, reference_scores(COMMENTS, duplicated))
+    assert scores == analyzer.batch_relevance_analysis(COMMENTS, VIDEOS)
+
+
+def test_batch_relevance_empty_vocabulary():
+    """Comments and videos made only of stop words score 0"""
+    comments = pd.DataFrame({'videoId': ['v1', 'v1'], 'textOriginal': ['the', 'and']})
+    videos = pd.DataFrame({'videoId': ['v1'], 'title': ['the'], 'description': [''], 'tags': ['']})
+
+    assert RelevanceAnalyzer().batch_relevance_analysis(comments, videos) == [0.0, 0.0]
@@ -0,0 +1,39 @@
+from model.text_features import text_features, repetitive_texts, LENGTH, WORD_COUNT, UPPER_COUNT
+
+
+TEXTS = [
+    "",
+    "   ",
+    "Nice video",
+    "love love love love it",
+    "so so good",
+    "first!",
+    "wow wow",
+    "WOW this Is GREAT",
+    "café crème brûlée café",
+    "\U0001f60d\U0001f60d \U0001f60d",
+    "a a a b",
+    "x　x　y　z",
+    "tab\tand\nnewline\r\nsplit",
+    "one one one\u0085two",
+    " leading and trailing　",
+]
+
+
+def test_text_features_match_python_string_methods():
+    """Length and word count follow len() and str.split(), uppercase counts ASCII A-Z"""
+    features = text_features(TEXTS)
+
+    assert features[:, LENGTH].tolist() == [len(text) for text in TEXTS]
+    assert features[:, WORD_COUNT].tolist() == [len(text.split()) for text in TEXTS]
+    assert features[:, UPPER_COUNT].tolist() == [sum(1 for c in text if 'A' <= c <= 'Z') for text in TEXTS]
+
+
+def test_repetitive_texts_match_distinct_word_ratio():
+    """Same rule as the repetition check in detect_spam, over len(set(text.split()))"""
+    expected = []
+    for text in TEXTS:
+        words = text.split()
+        expected.append(int(len(words) > 1 and len(set(words)) / len(words) < 0.5))
+
+    assert repetitive_texts(TEXTS).tolist() == expected
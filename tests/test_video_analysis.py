@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from model.video_analysis import VideoAnalyzer
+
+
+COMMENTS = pd.DataFrame({
+    'videoId': ['v1', 'v2', 'v1', 'v3', 'v2', 'v1', 'v3'],
+    'quality_score': [1, 0, 1, 0, 1, 0, 0],
+    'isSpam': [0, 1, 1, 0, 0, 0, 1],
+    'relevance_score': [0.5, 0.1, 0.3, 0.0, 0.7, 0.2, 0.05],
+    'sentiment': pd.Categorical(['positive', 'negative', 'positive', 'neutral', 'positive', 'negative', None]),
+    'category': pd.Categorical(['makeup', 'other', 'skincare', 'other', 'hair', 'makeup', None]),
+})
+
+
+def test_compare_videos_matches_per_video_metrics():
+    """One row per requested video with data, in request order, same values as analyze_video_performance"""
+    analyzer = VideoAnalyzer()
+    video_ids = ['v3', 'missing', 'v1', 'v2']
+
+    comparison = analyzer.compare_videos(COMMENTS, video_ids)
+
+    expected = []
+    for video_id in video_ids:
+        metrics = analyzer.analyze_video_performance(COMMENTS, video_id)
+        if metrics:
+            metrics['video_id'] = video_id
+            expected.append(metrics)
+    expected = pd.DataFrame(expected)
+
+    assert comparison.columns.tolist() == expected.columns.tolist()
+    assert comparison['video_id'].tolist() == ['v3', 'v1', 'v2']
+    for column in ['total_comments', 'high_quality_comments']:
+        assert comparison[column].tolist() == expected[column].tolist()
+    for column in ['quality_ratio', 'spam_rate', 'avg_relevance']:
+        np.testing.assert_allclose(comparison[column], expected[column])
+    for column in ['sentiment_breakdown', 'category_breakdown']:
+        for actual, wanted in zip(comparison[column], expected[column]):
+            assert actual.keys() == wanted.keys()
+            np.testing.assert_allclose([actual[key] for key in wanted], list(wanted.values()))
+
+
+def test_compare_videos_without_matches():
+    """No requested video has comments"""
+    assert VideoAnalyzer().compare_videos(COMMENTS, ['missing']).empty